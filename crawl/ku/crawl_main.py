@@ -4,18 +4,28 @@ from tqdm import tqdm
 import asyncio
 from crawl4ai import AsyncWebCrawler, BrowserConfig, CrawlerRunConfig
 from bs4 import BeautifulSoup
-from . import LOGGER
 import re
 from typing import List, Optional, Dict
 import requests
 from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
 import random
 import time
 import datetime
 from . import LOGGER, PDF_SAVE_DIR, METADATA_JSON_PATH
 
 
+# * one pooled session for every download, retries are handled by download_pdf_with_retries only
+_SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(pool_connections=32, pool_maxsize=32)
+_SESSION.mount("http://", _ADAPTER)
+_SESSION.mount("https://", _ADAPTER)
+
+# * set headers to appear more like a browser
+_SESSION.headers.update({
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+})
+
+
 def load_existing_results():
     if os.path.exists(METADATA_JSON_PATH):
         with open(METADATA_JSON_PATH, "r", encoding="utf-8") as f:
@@ -52,35 +62,17 @@ def download_pdf_with_retries(
     # * create directory if it doesn't exist
     os.makedirs(save_dir, exist_ok=True)
     
-    # * create session with connection pooling and retry strategy
-    session = requests.Session()
-    retry_strategy = Retry(
-        total=0,  # * we handle retries manually for better control
-        backoff_factor=0,
-        status_forcelist=[500, 502, 503, 504]
-    )
-    adapter = HTTPAdapter(max_retries=retry_strategy)
-    session.mount("http://", adapter)
-    session.mount("https://", adapter)
-    
-    # * set headers to appear more like a browser
-    session.headers.update({
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    })
-    
-    try:
-        for attempt in range(max_retries):
-            try:
-                LOGGER.info(f"[ATTEMPT {attempt + 1}/{max_retries}] Downloading: {pdf_download_url}")
-                
-                # * make request with streaming
-                response = session.get(
-                    pdf_download_url, 
-                    stream=True, 
-                    timeout=timeout,
-                    allow_redirects=True
-                )
-                
+    for attempt in range(max_retries):
+        try:
+            LOGGER.info(f"[ATTEMPT {attempt + 1}/{max_retries}] Downloading: {pdf_download_url}")
+            
+            # * make request with streaming, the connection goes back to the pool on exit
+            with _SESSION.get(
+                pdf_download_url, 
+                stream=True, 
+                timeout=timeout,
+                allow_redirects=True
+            ) as response:
                 if response.status_code == 200:
                     # * verify content type
                     content_type = response.headers.get('content-type', '').lower()
@@ -151,30 +143,26 @@ def download_pdf_with_retries(
                     wait_time = (2 ** attempt) + random.uniform(1.0, 3.0)
                     time.sleep(wait_time)
                     continue
-                    
-            except requests.exceptions.Timeout:
-                wait_time = (2 ** attempt) + random.uniform(1.0, 3.0)
-                LOGGER.error(f"[TIMEOUT] Request timed out. Retrying in {wait_time:.2f}s...")
-                time.sleep(wait_time)
-                
-            except requests.exceptions.ConnectionError:
-                wait_time = (2 ** attempt) + random.uniform(1.0, 3.0)
-                LOGGER.error(f"[CONNECTION ERROR] Network issue. Retrying in {wait_time:.2f}s...")
-                time.sleep(wait_time)
                 
-            except requests.exceptions.RequestException as e:
-                wait_time = (2 ** attempt) + random.uniform(1.0, 3.0)
-                LOGGER.error(f"[REQUEST ERROR] {str(e)}. Retrying in {wait_time:.2f}s...")
-                time.sleep(wait_time)
-                
-            except Exception as e:
-                wait_time = (2 ** attempt) + random.uniform(1.0, 3.0)
-                LOGGER.error(f"[UNEXPECTED ERROR] {str(e)}. Retrying in {wait_time:.2f}s...")
-                time.sleep(wait_time)
-    
-    finally:
-        # * cleanup session
-        session.close()
+        except requests.exceptions.Timeout:
+            wait_time = (2 ** attempt) + random.uniform(1.0, 3.0)
+            LOGGER.error(f"[TIMEOUT] Request timed out. Retrying in {wait_time:.2f}s...")
+            time.sleep(wait_time)
+            
+        except requests.exceptions.ConnectionError:
+            wait_time = (2 ** attempt) + random.uniform(1.0, 3.0)
+            LOGGER.error(f"[CONNECTION ERROR] Network issue. Retrying in {wait_time:.2f}s...")
+            time.sleep(wait_time)
+            
+        except requests.exceptions.RequestException as e:
+            wait_time = (2 ** attempt) + random.uniform(1.0, 3.0)
+            LOGGER.error(f"[REQUEST ERROR] {str(e)}. Retrying in {wait_time:.2f}s...")
+            time.sleep(wait_time)
+            
+        except Exception as e:
+            wait_time = (2 ** attempt) + random.uniform(1.0, 3.0)
+            LOGGER.error(f"[UNEXPECTED ERROR] {str(e)}. Retrying in {wait_time:.2f}s...")
+            time.sleep(wait_time)
     
     LOGGER.error(f"[GIVE UP] Failed to download after {max_retries} attempts: {pdf_download_url}")
     return None
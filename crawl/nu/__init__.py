@@ -12,6 +12,9 @@ DATA_PATH = os.path.join(ROOT_PATH, 'data')
 NU_DATA_PATH = os.path.join(DATA_PATH, 'nu')
 PDF_SAVE_DIR = os.path.join(NU_DATA_PATH, "pdfs")
 METADATA_JSON_PATH = os.path.join(NU_DATA_PATH, "metadata.json")
+METADATA_JSONL_PATH = os.path.join(NU_DATA_PATH, "metadata.jsonl")
+METADATA_PART_JSONL_PATH = os.path.join(NU_DATA_PATH, "metadata.part{}.jsonl")  # one per worker process
+DOWNLOADED_URLS_JSONL_PATH = os.path.join(NU_DATA_PATH, "downloaded_urls.jsonl")
 
 # Ensure log and save directory exists
 os.makedirs(NU_DATA_PATH, exist_ok=True)
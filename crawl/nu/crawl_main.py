@@ -2,244 +2,471 @@ import os
 import json
 from tqdm import tqdm
 import asyncio
-from crawl4ai import AsyncWebCrawler, BrowserConfig
-from . import LOGGER
+import glob
+import multiprocessing
+import aiohttp
+import aiofiles
+from crawl4ai import AsyncWebCrawler, BrowserConfig, CrawlerRunConfig, CacheMode
 import re
-from typing import List, Optional, Dict
-import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+from typing import List, Optional, Dict, Iterator
 import random
 import time
 import datetime
-from . import LOGGER, PDF_SAVE_DIR, METADATA_JSON_PATH
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+from . import LOGGER, PDF_SAVE_DIR, METADATA_JSON_PATH, METADATA_JSONL_PATH, METADATA_PART_JSONL_PATH, DOWNLOADED_URLS_JSONL_PATH
+
+
+NUM_WORKERS = 4  # processes, each with its own browser and event loop
+CONCURRENCY = 16  # max pages crawled at the same time, per worker
+CHUNK_SIZE = 32  # indexes dispatched per TaskGroup, results are saved once per chunk
+MAX_RETRY_AFTER = 30  # seconds, upper bound on any server-requested wait
+
+# * built once and shared by the single crawler of the run
+BROWSER_CONFIG = BrowserConfig(
+    headless=True, # set to False for debugging | show browser
+    verbose=False,
+)
+# * no session_id: pages are crawled concurrently, each task needs its own tab
+CRAWLER_RUN_CONFIG = CrawlerRunConfig(cache_mode=CacheMode.BYPASS)
+
+# * markdown links where both the label and the href contain '.pdf', compiled once for every page
+_PDF_LINK_RE = re.compile(r'\*?\s*\[([^\]]*\.pdf[^\]]*)\]\((https?://[^\s\)]*\.pdf)[^\)]*\)')
+
+# * set headers to appear more like a browser
+HTTP_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+
+class TokenBucket:
+    """
+    Adaptive token bucket limiting the request rate to one host.
+
+    Every successful download raises the refill rate a little; a 429 or 5xx
+    halves it and empties the bucket, so all workers hitting the host back off
+    together and the rate converges near what the server accepts.
+    """
+
+    def __init__(self, rate: float = 2.0, capacity: float = 4.0, min_rate: float = 0.2, max_rate: float = 16.0):
+        self.rate = rate  # tokens (requests) per second
+        self.capacity = capacity
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self) -> None:
+        # * wait until a token is available, other tasks keep running meanwhile
+        while True:
+            now = time.monotonic()
+            if now < self.paused_until:
+                wait_time = self.paused_until - now
+            else:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait_time = (1 - self.tokens) / self.rate
+            await asyncio.sleep(wait_time)
+
+    def increase_rate(self, delta: float = 0.5) -> None:
+        self.rate = min(self.max_rate, self.rate + delta)
+
+    def decrease_rate(self, factor: float = 0.5) -> None:
+        self._refill()
+        self.rate = max(self.min_rate, self.rate * factor)
+        self.tokens = 0
+
+    def pause(self, seconds: float) -> None:
+        # * hold every request to the host, e.g. for the server's Retry-After
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+
+# * one bucket per host, shared by every download of the process
+_BUCKETS: Dict[str, TokenBucket] = {}
+_BUCKET_LIMITS: Dict[str, float] = {}
+
+
+def configure_buckets(num_workers: int):
+    """
+    Split the per-host limits between the worker processes, every process has
+    its own buckets so together they stay within what a single bucket allows.
+
+    Args:
+        num_workers: Number of processes crawling at the same time
+    """
+    defaults = TokenBucket()
+    _BUCKET_LIMITS.update(
+        rate=defaults.rate / num_workers,
+        capacity=max(1.0, defaults.capacity / num_workers),
+        min_rate=defaults.min_rate / num_workers,
+        max_rate=defaults.max_rate / num_workers,
+    )
+    _BUCKETS.clear()
+
+
+def get_bucket(url: str) -> TokenBucket:
+    host = urlparse(url).netloc
+    if host not in _BUCKETS:
+        _BUCKETS[host] = TokenBucket(**_BUCKET_LIMITS)
+    return _BUCKETS[host]
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header, given either as delay-seconds or as an HTTP-date.
+
+    Returns:
+        float: Seconds to wait (capped at MAX_RETRY_AFTER), None if missing or unparsable
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return min(float(value), MAX_RETRY_AFTER)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=datetime.timezone.utc)
+    delay = (retry_at - datetime.datetime.now(datetime.timezone.utc)).total_seconds()
+    return min(max(delay, 0.0), MAX_RETRY_AFTER)
+
+
+def load_results_jsonl(path: str) -> Iterator[tuple]:
+    # * one record per line, appended as chunks finish
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                LOGGER.warning("[SKIP] Unreadable line in %s: %r", path, line[:100])
+                continue
+            yield str(record["index"]), record["metadata"] # JSON keys are strings
+
+
+def metadata_part_paths() -> List[str]:
+    # * parts written by the workers, left behind if a run was interrupted
+    return sorted(glob.glob(METADATA_PART_JSONL_PATH.format("*")))
 
 
 def load_existing_results():
+    results = {}
+
+    # * snapshot written by older runs
     if os.path.exists(METADATA_JSON_PATH):
         with open(METADATA_JSON_PATH, "r", encoding="utf-8") as f:
-            return json.load(f)
-    return {}
+            results.update(json.load(f))
+
+    for path in [METADATA_JSONL_PATH, *metadata_part_paths()]:
+        if os.path.exists(path):
+            results.update(load_results_jsonl(path))
+
+    return results
+
+
+def append_results(new_results: Dict[int, Dict], path: str = METADATA_JSONL_PATH):
+    # * append-only, earlier records are never re-serialized
+    with open(path, "a", encoding="utf-8") as f:
+        for index, metadata in new_results.items():
+            f.write(json.dumps({"index": index, "metadata": metadata}, ensure_ascii=False) + "\n")
+
 
+# * url -> filepath of every PDF already on disk, the same PDF is often linked from several handles
+_DOWNLOADED_URLS: Dict[str, str] = {}
+_DOWNLOADED_URLS_OFFSET = 0  # bytes of downloaded_urls.jsonl already read
 
-def save_results(results):
-    with open(METADATA_JSON_PATH, "w", encoding="utf-8") as f:
-        json.dump(results, f, ensure_ascii=False, indent=4)
 
+def refresh_downloaded_urls():
+    """
+    Read the records appended to downloaded_urls.jsonl since the last call,
+    so downloads finished by the other worker processes are picked up.
+    """
+    global _DOWNLOADED_URLS_OFFSET
+    if not os.path.exists(DOWNLOADED_URLS_JSONL_PATH):
+        return
+    with open(DOWNLOADED_URLS_JSONL_PATH, "rb") as f:
+        f.seek(_DOWNLOADED_URLS_OFFSET)
+        for line in f:
+            if not line.endswith(b"\n"):
+                break  # another process is still appending it, read it next time
+            _DOWNLOADED_URLS_OFFSET += len(line)
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                LOGGER.warning("[SKIP] Unreadable line in %s: %r", DOWNLOADED_URLS_JSONL_PATH, line[:100])
+                continue
+            _DOWNLOADED_URLS[record["url"]] = record["filepath"]
+
+
+def remember_download(url: str, filepath: str):
+    _DOWNLOADED_URLS[url] = filepath
+    with open(DOWNLOADED_URLS_JSONL_PATH, "a", encoding="utf-8") as f:
+        f.write(json.dumps({"url": url, "filepath": filepath}, ensure_ascii=False) + "\n")
+
+
+refresh_downloaded_urls()
+
+
+def local_size(filepath: Optional[str]) -> int:
+    # * size of the file on disk, 0 when there is nothing to resume from
+    if not filepath:
+        return 0
+    try:
+        return os.stat(filepath).st_size
+    except FileNotFoundError:
+        return 0
+
+
+async def fetch_content_length(http: aiohttp.ClientSession, url: str, timeout: aiohttp.ClientTimeout) -> Optional[int]:
+    """
+    Ask the server for the size of a file without downloading it.
+
+    Args:
+        http: Shared aiohttp session
+        url: URL of the file
+        timeout: Timeout applied to the HEAD request
 
-def download_pdf_with_retries(
+    Returns:
+        int: Content-Length reported by the server, None if unknown or the request failed
+    """
+    await get_bucket(url).acquire()
+    try:
+        async with http.head(url, timeout=timeout, allow_redirects=True) as response:
+            if response.status != 200:
+                return None
+            content_length = response.headers.get("Content-Length", "")
+            return int(content_length) if content_length.isdigit() else None
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        LOGGER.warning("[HEAD ERROR] %s: %s", url, e)
+        return None
+
+
+async def download_pdf_with_retries(
+    http: aiohttp.ClientSession,
     pdf_download_url: str, 
     save_dir: str, 
     max_retries: int = 5,
     timeout: int = 30,
-    chunk_size: int = 8192
+    chunk_size: int = 64 * 1024,
+    filepath: Optional[str] = None
 ) -> Optional[str]:
     """
     Download PDF with exponential backoff retry logic and robust error handling.
+    A partially written file is resumed with a Range request instead of starting over.
     
     Args:
+        http: Shared aiohttp session, its connector pools connections across downloads
         pdf_download_url: URL to download PDF from
-        save_dir: Directory to save the file
+        save_dir: Directory to save the file, must already exist (PDF_SAVE_DIR is created on import)
         max_retries: Maximum number of retry attempts
-        timeout: Request timeout in seconds
-        chunk_size: Size of chunks for streaming download
+        timeout: Connect and per-read timeout in seconds
+        chunk_size: Size of chunks read from the socket and written to disk
+        filepath: Local copy from an earlier run, returned as is when its size matches the server's
     
     Returns:
         str: Filepath if successful, None if failed
     """
-    
-    # * create directory if it doesn't exist
-    os.makedirs(save_dir, exist_ok=True)
-    
-    # * create session with connection pooling and retry strategy
-    session = requests.Session()
-    retry_strategy = Retry(
-        total=0,  # * we handle retries manually for better control
-        backoff_factor=0,
-        status_forcelist=[500, 502, 503, 504]
-    )
-    adapter = HTTPAdapter(max_retries=retry_strategy)
-    session.mount("http://", adapter)
-    session.mount("https://", adapter)
-    
-    # * set headers to appear more like a browser
-    session.headers.update({
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    })
-    
-    try:
-        for attempt in range(max_retries):
-            try:
-                LOGGER.info(f"[ATTEMPT {attempt + 1}/{max_retries}] Downloading: {pdf_download_url}")
-                
-                # * make request with streaming
-                response = session.get(
-                    pdf_download_url, 
-                    stream=True, 
-                    timeout=timeout,
-                    allow_redirects=True
-                )
-                
-                if response.status_code == 200:
+    request_timeout = aiohttp.ClientTimeout(total=None, sock_connect=timeout, sock_read=timeout)
+    bucket = get_bucket(pdf_download_url)
+
+    # * early exit when the local copy is already complete
+    if filepath:
+        expected_size = await fetch_content_length(http, pdf_download_url, request_timeout)
+        downloaded_size = local_size(filepath)
+        if expected_size is None or downloaded_size == expected_size:
+            LOGGER.info("[CACHE HIT] Already downloaded: %s", pdf_download_url)
+            return filepath
+        if downloaded_size > expected_size:
+            os.remove(filepath)  # * file changed on the server, fetch it again from byte 0
+            downloaded_size = 0
+        LOGGER.info("[RESUME] %s has %s/%s bytes", filepath, downloaded_size, expected_size)
+
+    for attempt in range(max_retries):
+        try:
+            # * wait for the host's rate limiter before every attempt
+            await bucket.acquire()
+            LOGGER.info("[ATTEMPT %s/%s] Downloading: %s", attempt + 1, max_retries, pdf_download_url)
+            
+            # * continue from the bytes already on disk, a dropped stream doesn't restart from 0
+            downloaded_size = local_size(filepath)
+            headers = {"Range": f"bytes={downloaded_size}-"} if downloaded_size else None
+            
+            # * make request with streaming, the connection goes back to the pool on exit
+            async with http.get(
+                pdf_download_url, 
+                headers=headers,
+                timeout=request_timeout,
+                allow_redirects=True
+            ) as response:
+                if response.status == 416 and downloaded_size:
+                    # * nothing left past the bytes we have
+                    LOGGER.info("[SUCCESS] PDF already complete: %s", filepath)
+                    bucket.increase_rate()
+                    return filepath
+
+                if response.status in [200, 206]:
                     # * verify content type
                     content_type = response.headers.get('content-type', '').lower()
                     if 'pdf' not in content_type and 'application/pdf' not in content_type:
-                        LOGGER.warning(f"[WARNING] Content type may not be PDF: {content_type}")
-                    
-                    # * generate filename with better logic
-                    basename = pdf_download_url.split("/")[-1].split("?")[0]
-                    if not basename:
-                        basename = f"file_{int(time.time())}"
+                        LOGGER.warning("[WARNING] Content type may not be PDF: %s", content_type)
                     
-                    name, ext = os.path.splitext(basename)
-                    if not ext or ext.lower() != '.pdf':
-                        ext = ".pdf"
+                    if filepath is None:
+                        # * generate filename with better logic
+                        basename = pdf_download_url.split("/")[-1].split("?")[0]
+                        if not basename:
+                            basename = f"file_{int(time.time())}"
                     
-                    # * add timestamp to avoid conflicts
-                    max_name_length = 100  # avoid file name too long error
-                    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-                    filename = f"{name[:max_name_length]}_{timestamp}{ext}"
-                    filepath = os.path.join(save_dir, filename)
+                        name, ext = os.path.splitext(basename)
+                        if not ext or ext.lower() != '.pdf':
+                            ext = ".pdf"
                     
-                    # * download with progress tracking
-                    total_size = int(response.headers.get('content-length', 0))
-                    downloaded_size = 0
+                        # * add a nanosecond suffix so concurrent downloads never collide
+                        max_name_length = 100  # avoid file name too long error
+                        suffix = f"{time.time_ns():x}"
+                        filename = f"{name[:max_name_length]}_{suffix}{ext}"
+                        filepath = os.path.join(save_dir, filename)
                     
-                    with open(filepath, "wb") as f:
-                        for chunk in response.iter_content(chunk_size=chunk_size):
-                            if chunk:  # * filter out keep-alive chunks
-                                f.write(chunk)
-                                downloaded_size += len(chunk)
-                                
-                                # * log progress for large files
-                                if total_size > 0 and downloaded_size % (chunk_size * 100) == 0:
-                                    progress = (downloaded_size / total_size) * 100
-                                    LOGGER.debug(f"[PROGRESS] {progress:.1f}% downloaded")
+                    # * append on 206, a plain 200 means the server ignored the Range and sends everything
+                    mode = "ab" if response.status == 206 else "wb"
+                    # * stream to disk chunk by chunk, writes run in a thread so the event loop never blocks on disk
+                    async with aiofiles.open(filepath, mode) as f:
+                        async for chunk in response.content.iter_chunked(chunk_size):
+                            await f.write(chunk)
                     
-                    # * verify file was created and has content
-                    if os.path.exists(filepath) and os.path.getsize(filepath) > 0:
-                        LOGGER.info(f"[SUCCESS] PDF saved to: {filepath}")
+                    # * verify file was created and has content, one stat call for both checks
+                    try:
+                        file_size = os.stat(filepath).st_size
+                    except FileNotFoundError:
+                        file_size = None
+
+                    if file_size:
+                        LOGGER.info("[SUCCESS] PDF saved to: %s", filepath)
+                        bucket.increase_rate()
                         return filepath
                     else:
-                        LOGGER.error(f"[ERROR] File creation failed or file is empty: {filepath}")
-                        if os.path.exists(filepath):
+                        LOGGER.error("[ERROR] File creation failed or file is empty: %s", filepath)
+                        if file_size is not None:
                             os.remove(filepath)  # * cleanup empty file
+                        filepath = None
                         continue
                 
-                elif response.status_code == 429:
-                    # * rate limiting - exponential backoff with jitter
-                    wait_time = (2 ** attempt) + random.uniform(1.0, 5.0)
-                    LOGGER.warning(f"[RATE LIMIT] Got 429. Retrying in {wait_time:.2f}s...")
-                    time.sleep(wait_time)
+                elif response.status == 429:
+                    # * rate limiting - slow down every download to this host
+                    bucket.decrease_rate()
+                    # * honor the server's Retry-After, else exponential backoff with jitter
+                    wait_time = parse_retry_after(response.headers.get("Retry-After"))
+                    if wait_time is None:
+                        wait_time = min((2 ** attempt) + random.uniform(1.0, 5.0), MAX_RETRY_AFTER)
+                    bucket.pause(wait_time)
+                    LOGGER.warning("[RATE LIMIT] Got 429. Host rate lowered to %.2f req/s, retrying in %.2fs...", bucket.rate, wait_time)
                     continue
                 
-                elif response.status_code in [403, 404]:
+                elif response.status in [403, 404]:
                     # * client errors - don't retry
-                    LOGGER.error(f"[CLIENT ERROR] HTTP {response.status_code} - not retrying: {pdf_download_url}")
+                    LOGGER.error("[CLIENT ERROR] HTTP %s - not retrying: %s", response.status, pdf_download_url)
                     return None
                 
-                elif response.status_code >= 500:
-                    # * server errors - retry with backoff
-                    wait_time = (2 ** attempt) + random.uniform(1.0, 3.0)
-                    LOGGER.warning(f"[SERVER ERROR] HTTP {response.status_code}. Retrying in {wait_time:.2f}s...")
-                    time.sleep(wait_time)
+                elif response.status >= 500:
+                    # * server errors - overloaded server, slow down every download to this host
+                    bucket.decrease_rate()
+                    LOGGER.warning("[SERVER ERROR] HTTP %s. Host rate lowered to %.2f req/s, retrying...", response.status, bucket.rate)
                     continue
                 
                 else:
                     # * other status codes
-                    LOGGER.warning(f"[UNEXPECTED] HTTP {response.status_code} for {pdf_download_url}")
+                    LOGGER.warning("[UNEXPECTED] HTTP %s for %s", response.status, pdf_download_url)
                     wait_time = (2 ** attempt) + random.uniform(1.0, 3.0)
-                    time.sleep(wait_time)
+                    await asyncio.sleep(wait_time)
                     continue
                     
-            except requests.exceptions.Timeout:
-                wait_time = (2 ** attempt) + random.uniform(1.0, 3.0)
-                LOGGER.error(f"[TIMEOUT] Request timed out. Retrying in {wait_time:.2f}s...")
-                time.sleep(wait_time)
-                
-            except requests.exceptions.ConnectionError:
-                wait_time = (2 ** attempt) + random.uniform(1.0, 3.0)
-                LOGGER.error(f"[CONNECTION ERROR] Network issue. Retrying in {wait_time:.2f}s...")
-                time.sleep(wait_time)
-                
-            except requests.exceptions.RequestException as e:
-                wait_time = (2 ** attempt) + random.uniform(1.0, 3.0)
-                LOGGER.error(f"[REQUEST ERROR] {str(e)}. Retrying in {wait_time:.2f}s...")
-                time.sleep(wait_time)
-                
-            except Exception as e:
-                wait_time = (2 ** attempt) + random.uniform(1.0, 3.0)
-                LOGGER.error(f"[UNEXPECTED ERROR] {str(e)}. Retrying in {wait_time:.2f}s...")
-                time.sleep(wait_time)
-    
-    finally:
-        # * cleanup session
-        session.close()
+        except asyncio.TimeoutError:
+            wait_time = (2 ** attempt) + random.uniform(1.0, 3.0)
+            LOGGER.error("[TIMEOUT] Request timed out. Retrying in %.2fs...", wait_time)
+            await asyncio.sleep(wait_time)
+            
+        except aiohttp.ClientConnectionError:
+            wait_time = (2 ** attempt) + random.uniform(1.0, 3.0)
+            LOGGER.error("[CONNECTION ERROR] Network issue. Retrying in %.2fs...", wait_time)
+            await asyncio.sleep(wait_time)
+            
+        except aiohttp.ClientError as e:
+            wait_time = (2 ** attempt) + random.uniform(1.0, 3.0)
+            LOGGER.error("[REQUEST ERROR] %s. Retrying in %.2fs...", e, wait_time)
+            await asyncio.sleep(wait_time)
+            
+        except Exception as e:
+            wait_time = (2 ** attempt) + random.uniform(1.0, 3.0)
+            LOGGER.error("[UNEXPECTED ERROR] %s. Retrying in %.2fs...", e, wait_time)
+            await asyncio.sleep(wait_time)
     
-    LOGGER.error(f"[GIVE UP] Failed to download after {max_retries} attempts: {pdf_download_url}")
+    LOGGER.error("[GIVE UP] Failed to download after %s attempts: %s", max_retries, pdf_download_url)
     return None
 
 
-def extract_pdf_links_with_label_check(markdown_content: str) -> List[Dict]:
+def extract_pdf_links_with_label_check(markdown_content: str) -> Iterator[Dict]:
     """
-    Extracts markdown links where both the label and the href contain '.pdf'.
+    Lazily extracts markdown links where both the label and the href contain '.pdf'.
 
     Args:
         markdown_content (str): The markdown string to search.
 
-    Returns:
-        List[Dict]: A list of dictionaries with 'text' and 'download_url'.
+    Yields:
+        Dict: A dictionary with 'text' and 'download_url' per link, in page order.
     """
-    pattern = r'\*?\s*\[([^\]]*\.pdf[^\]]*)\]\((https?://[^\s\)]*\.pdf)[^\)]*\)'
-
-    matches = re.findall(pattern, markdown_content)
-    
-    extracted_links = []
-    for link_text, url in matches:
-        extracted_links.append({
+    for match in _PDF_LINK_RE.finditer(markdown_content):
+        link_text, url = match.groups()
+        yield {
             'text': link_text.strip(),
             'download_url': url
-        })
+        }
 
-    return extracted_links
 
-
-async def crawl_webpage(url: str, verbose: bool = False):
-    browser_config = BrowserConfig(
-        headless=True, # set to False for debugging | show browser
-        verbose=False,
-    )
+async def crawl_webpage(crawler: AsyncWebCrawler, url: str, verbose: bool = False):
     try:
-        async with AsyncWebCrawler(config=browser_config) as crawler:
-            # * crawl the webpage
-            result = await crawler.arun(url=url)
-            if result.success:
-                LOGGER.info(f"✅ Result Length: {len(result.cleaned_html)}")
-                if verbose:
-                    LOGGER.info("\n ======= Preview all the content =======\n")
-                    LOGGER.info(f"{result.markdown}\n")
-            return result.markdown
+        # * crawl the webpage with the shared browser
+        result = await crawler.arun(url=url, config=CRAWLER_RUN_CONFIG)
+        if result.success:
+            LOGGER.info("✅ Result Length: %s", len(result.cleaned_html))
+            if verbose:
+                LOGGER.info("\n ======= Preview all the content =======\n")
+                LOGGER.info("%s\n", result.markdown)
+        return result.markdown
     except Exception as e:
-        LOGGER.error(f"[CRAWL ERROR] Unexpected error in crawl_webpage: {str(e)}")
+        LOGGER.error("[CRAWL ERROR] Unexpected error in crawl_webpage: %s", e)
         return None
 
 
 def get_download_links(result_markdown: str):
     LOGGER.info("[LINK EXTRACTION] Searching for download links...")
-    links_to_download = extract_pdf_links_with_label_check(result_markdown)
+
+    # * consume links as they are matched, skipping pdfs linked more than once on the page
+    links_to_download = []
+    seen_urls = set()
+    for link_data in extract_pdf_links_with_label_check(result_markdown):
+        if link_data['download_url'] in seen_urls:
+            continue
+        seen_urls.add(link_data['download_url'])
+        links_to_download.append(link_data)
+        LOGGER.info("[LINK %s] Text: '%s' | URL: %s", len(links_to_download), link_data['text'], link_data['download_url'])
+
     if not links_to_download:
         LOGGER.warning("[NO LINKS] No download links found in content")
         return None
-
-    # * log found links
-    for i, link_data in enumerate(links_to_download):
-        LOGGER.info(f"[LINK {i+1}] Text: '{link_data['text']}' | URL: {link_data['download_url']}")
     
     return links_to_download
 
 
-async def crawl_and_download_pdf(url: str) -> List[str]:
-    result_markdown = await crawl_webpage(url)
+async def crawl_and_download_pdf(crawler: AsyncWebCrawler, http: aiohttp.ClientSession, url: str) -> List[str]:
+    result_markdown = await crawl_webpage(crawler, url)
     if not result_markdown:
         return None
     
@@ -251,26 +478,37 @@ async def crawl_and_download_pdf(url: str) -> List[str]:
     downloaded_files = []
     for i, link_data in enumerate(links_to_download):
         try:
-            LOGGER.info(f"[DOWNLOAD START] Downloading file {i+1}/{len(links_to_download)}")
+            LOGGER.info("[DOWNLOAD START] Downloading file %s/%s", i+1, len(links_to_download))
             
-            filepath = download_pdf_with_retries(
+            # * a PDF already on disk is only checked against the server's size, resumed if partial,
+            # * re-read first since another worker process may have just downloaded it
+            refresh_downloaded_urls()
+            cached_filepath = _DOWNLOADED_URLS.get(link_data["download_url"])
+            if cached_filepath and not os.path.exists(cached_filepath):
+                cached_filepath = None
+
+            filepath = await download_pdf_with_retries(
+                http,
                 pdf_download_url=link_data["download_url"],
                 save_dir=PDF_SAVE_DIR,
+                filepath=cached_filepath,
             )
             
             if filepath:
+                if filepath != cached_filepath:
+                    remember_download(link_data["download_url"], filepath)
                 downloaded_files.append(filepath)
-                LOGGER.info(f"[DOWNLOAD SUCCESS] File saved: {filepath}")
+                LOGGER.info("[DOWNLOAD SUCCESS] File saved: %s", filepath)
             else:
-                LOGGER.error(f"[DOWNLOAD FAILURE] Failed to download: {link_data['download_url']}")
+                LOGGER.error("[DOWNLOAD FAILURE] Failed to download: %s", link_data['download_url'])
                 
         except Exception as e:
-            LOGGER.error(f"[DOWNLOAD EXCEPTION] Error downloading {link_data['download_url']}: {str(e)}")
+            LOGGER.error("[DOWNLOAD EXCEPTION] Error downloading %s: %s", link_data['download_url'], e)
             continue
     
     # * return result
     if downloaded_files:
-        LOGGER.info(f"[OPERATION SUCCESS] Downloaded {len(downloaded_files)} file(s)")
+        LOGGER.info("[OPERATION SUCCESS] Downloaded %s file(s)", len(downloaded_files))
         metadata = {"source_url": url, 
                     "download_url": links_to_download, 
                     "downloaded_filename": [os.path.basename(f) for f in downloaded_files]}
@@ -280,37 +518,95 @@ async def crawl_and_download_pdf(url: str) -> List[str]:
         return None
 
 
-async def main():
+async def process_index(sem: asyncio.Semaphore, crawler: AsyncWebCrawler, http: aiohttp.ClientSession, index: int) -> Dict:
+    # our target url to each nu webpage
+    target_url = f"https://nuir.lib.nu.ac.th/dspace/handle/123456789/{index}"
+
+    async with sem:
+        LOGGER.info("[START] start crawling %s", target_url)
+        metadata = await crawl_and_download_pdf(crawler, http, target_url)
+
+    if not metadata:
+        metadata = {"source_url": target_url, 
+                    "download_url": None, 
+                    "downloaded_filename": None}
+    return metadata
+
+
+def merge_results_parts():
+    # * fold every worker's part into metadata.jsonl, a part is removed only once it was copied
+    for path in metadata_part_paths():
+        with open(path, "r", encoding="utf-8") as src, open(METADATA_JSONL_PATH, "a", encoding="utf-8") as dst:
+            for line in src:
+                if line.strip():
+                    dst.write(line if line.endswith("\n") else line + "\n")
+        os.remove(path)
+        LOGGER.info("[MERGE] Merged %s into %s", path, METADATA_JSONL_PATH)
+
+
+async def run(worker_id: int, pending: List[int], num_workers: int = 1):
+    """
+    Crawl a slice of the index range with one browser and one HTTP session.
+
+    Args:
+        worker_id: Worker number, picks the part file and the progress bar row
+        pending: Indexes to crawl, none of them processed yet
+        num_workers: Number of worker processes, the per-host rate limit is split between them
+    """
+    configure_buckets(num_workers)
+    results_path = METADATA_PART_JSONL_PATH.format(worker_id)
+    sem = asyncio.Semaphore(CONCURRENCY)
+
+    # * one browser and one pooled HTTP session per worker, shared by every task in it
+    connector = aiohttp.TCPConnector(limit=32, limit_per_host=8, keepalive_timeout=30)
+    async with (
+        AsyncWebCrawler(config=BROWSER_CONFIG) as crawler,
+        aiohttp.ClientSession(connector=connector, headers=HTTP_HEADERS) as http,
+    ):
+        with tqdm(total=len(pending), position=worker_id, desc=f"worker {worker_id}") as progress:
+            for chunk_start in range(0, len(pending), CHUNK_SIZE):
+                chunk = pending[chunk_start:chunk_start + CHUNK_SIZE]
+
+                async with asyncio.TaskGroup() as tg:
+                    tasks = {index: tg.create_task(process_index(sem, crawler, http, index)) for index in chunk}
+
+                chunk_results = {index: task.result() for index, task in tasks.items()}
+
+                # Append once per chunk instead of rewriting the whole file after every item
+                append_results(chunk_results, results_path)
+                progress.update(len(chunk))
+                LOGGER.info("[LOG] Appended results of index %s-%s to %s.", chunk[0], chunk[-1], results_path)
+
+
+def worker(args: tuple):
+    # * every process runs its own event loop, browser and HTTP session
+    worker_id, pending, num_workers = args
+    asyncio.run(run(worker_id, pending, num_workers))
+
+
+def main():
     MAX_ID = 1000
     results = load_existing_results()
 
-    for index in tqdm(range(1, MAX_ID)):
-        # our target url to each ku webpage
-        target_url = f"https://nuir.lib.nu.ac.th/dspace/handle/123456789/{index}"
+    # * skip already processed up front, so the progress bars only count real work
+    done_ids = set(map(int, results.keys())) # JSON keys are strings
+    pending = [index for index in range(1, MAX_ID) if index not in done_ids]
+    LOGGER.info("[SKIP] %s index(es) already processed, %s left to crawl", len(done_ids), len(pending))
 
-        # skip already processed
-        if str(index) in results: # JSON keys are strings
-            LOGGER.info(f"[SKIP] Already processed index: {index}, url: {target_url}")
-            LOGGER.info(f"================= [ITEM] Finished item index: {index} ================= ")
-            continue
+    # * parts of an interrupted run are already counted in done_ids, start from clean parts
+    merge_results_parts()
 
-        # crawl and download pdf
-        LOGGER.info(f"[START] start crawling {target_url}")
-        metadata = await crawl_and_download_pdf(target_url)
+    # * strided slices, so every worker gets a similar mix of low and high ids
+    slices = [(worker_id, pending[worker_id::NUM_WORKERS]) for worker_id in range(NUM_WORKERS)]
+    slices = [(worker_id, indexes) for worker_id, indexes in slices if indexes]
+    # * every worker gets the process count, so the per-host limits add up to one bucket's
+    slices = [(worker_id, indexes, len(slices)) for worker_id, indexes in slices]
+    if slices:
+        with multiprocessing.Pool(len(slices)) as pool:
+            pool.map(worker, slices)
 
-        if metadata:
-            results[index] = metadata
-            # Save after each successful download
-            save_results(results)
-            LOGGER.info(f"[LOG] Updated results to JSON.")
-        else:
-            metadata = {"source_url": target_url, 
-                        "download_url": None, 
-                        "downloaded_filename": None}
-            results[index] = metadata
-            save_results(results)
-            LOGGER.info(f"[LOG] Updated None results to JSON.")
+    merge_results_parts()
 
 
 if __name__ == "__main__":
-   asyncio.run(main())
\ No newline at end of file
+    main()
\ No newline at end of file
@@ -17,26 +17,24 @@ class PDFScraper(SerpapiScraper):
     def scrape_pdfs(self) -> None:
         search_term = f"site:{self.domain_name} filetype:pdf"
         scraped_data = super().scrape(query=search_term)
-        # get pdf urls
-        pdf_urls = []
+        # get pdf urls, the same PDF often shows up on several result pages
+        pdf_urls: set[str] = set()
         for response in scraped_data:
             for result in response.get("organic_results", []):
                 link = result.get("link", "")
-                if link.lower().endswith(".pdf"):
-                    pdf_urls.append(link)
-        LOGGER.info(f"Found {len(pdf_urls)} PDF urls.")
+                if link.lower().endswith(".pdf") and link not in pdf_urls:
+                    pdf_urls.add(link)
+                    LOGGER.debug("PDF url: %s", link)
+        LOGGER.info("Found %s PDF urls.", len(pdf_urls))
 
-        # Check if URLs are downloadable PDFs
-        valid_pdf_urls = check_pdf_downloadable(pdf_urls) # Convert set to list for tqdm
-        LOGGER.info("\n--- Downloadable PDF URLs Summary ---")
-        for url in sorted(valid_pdf_urls):
-            LOGGER.info(url)
+        # Check if URLs are downloadable PDFs, each one is logged as it is checked
+        valid_pdf_urls = check_pdf_downloadable(pdf_urls)
 
         # Download the PDFs
-        LOGGER.info(f"PDFs will be downloaded to: {self.pdf_download_dir}")
+        LOGGER.info("PDFs will be downloaded to: %s", self.pdf_download_dir)
         download_pdfs(urls=valid_pdf_urls, download_folder=self.pdf_download_dir)
 
-        LOGGER.info(f"\nTotal Downloadable PDF URLs Found: {len(valid_pdf_urls)}")
+        LOGGER.info("\nTotal Downloadable PDF URLs Found: %s", len(valid_pdf_urls))
         LOGGER.info("Script finished.")
 
 
@@ -62,7 +60,7 @@ def parse_args():
 def main():
     args = parse_args()
 
-    LOGGER.info(f"🚀 Starting PDF scraping for domain: {args.domain_name}")
+    LOGGER.info("🚀 Starting PDF scraping for domain: %s", args.domain_name)
     
     scraper = PDFScraper(data_name=args.data_name, domain_name=args.domain_name)
     scraper.scrape_pdfs()
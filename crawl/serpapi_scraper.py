@@ -1,11 +1,15 @@
 import os
 from typing import List, Dict, Any
 from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 import time
 from serpapi import GoogleSearch
 from utils.logger import LOGGER
 
 
+MAX_WORKERS = 4  # pages requested at the same time, i.e. how far we speculatively fetch ahead
+
+
 @contextmanager
 def timing(description=""):
     start = time.time()
@@ -41,31 +45,51 @@ class SerpapiScraper:
             LOGGER.error(f"Error while fetching from SerpAPI at start={start}: {e}")
             return None
         
+    def _page_has_results(self, page_data: Dict, start: int) -> bool:
+        if not page_data:
+            LOGGER.warning(f"⚠️  Empty response or error occurred at start={start}. Stopping.")
+            return False
+
+        organic_results = page_data.get("organic_results", [])
+        if not organic_results:
+            LOGGER.info(f"✅ No more organic results at start={start}. Ending loop.")
+            return False
+
+        LOGGER.info(f"✅ Retrieved {len(organic_results)} results at start={start}")
+        return True
+
     def scrape(self, query: str = "search query") -> List[Any]:
         # setting up serpapi
         # query = "site:innodev.moe.go.th filetype:pdf"
         num = 100
-        start = 0
 
-        # fetch all data
+        # the first page is fetched alone, it tells how many results to expect
         results = []
-        while True:
-            with timing(f"⏱️ Fetching data (start={start})"):
-                page_data = self.fetch_from_query(query, num=num, start=start)
+        with timing("⏱️ Fetching data (start=0)"):
+            first_page = self.fetch_from_query(query, num=num, start=0)
+        if not self._page_has_results(first_page, start=0):
+            return results
+        results.append(first_page)
+
+        # google's total is only an estimate, so it caps the offsets but an empty page still ends the loop
+        total_results = first_page.get("search_information", {}).get("total_results")
 
-            if not page_data:
-                LOGGER.warning(f"⚠️  Empty response or error occurred at start={start}. Stopping.")
-                break
+        # keep going next pages, MAX_WORKERS pages at a time, until all
+        start = num
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            while total_results is None or start < total_results:
+                offsets = [start + i * num for i in range(MAX_WORKERS)]
+                if total_results is not None:
+                    offsets = [offset for offset in offsets if offset < total_results]
 
-            organic_results = page_data.get("organic_results", [])
-            if not organic_results:
-                LOGGER.info(f"✅ No more organic results at start={start}. Ending loop.")
-                break
+                with timing(f"⏱️ Fetching data (start={offsets[0]}..{offsets[-1]})"):
+                    pages = list(executor.map(lambda offset: self.fetch_from_query(query, num=num, start=offset), offsets))
 
-            LOGGER.info(f"✅ Retrieved {len(organic_results)} results at start={start}")
-            results.append(page_data)
+                for offset, page_data in zip(offsets, pages):
+                    if not self._page_has_results(page_data, start=offset):
+                        return results
+                    results.append(page_data)
 
-            # keep going next page, until all
-            start += num
+                start = offsets[-1] + num
         
-        return results
\ No newline at end of file
+        return results
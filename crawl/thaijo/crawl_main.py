@@ -1,14 +1,15 @@
 import os
 import json
-from tqdm import tqdm
+from tqdm.asyncio import tqdm
 from typing import List, Dict
 import asyncio
 from crawl4ai import AsyncWebCrawler, CrawlerRunConfig, CacheMode, BrowserConfig
 from . import THAIJO_DATA_PATH, LOGGER
-from .utils import extract_markdown_from_h2, extract_markdown_links_as_json, extract_pdf_links_from_markdown, get_pdf_links_from_json, check_pdf_downloadable, download_pdfs
+from .utils import extract_markdown_from_h2, extract_markdown_links_as_json, extract_pdf_links_from_markdown, get_pdf_links_from_json
 
 
 URL = "https://www.tci-thaijo.org/"
+CONCURRENCY = 16  # max magazine pages crawled at the same time
 
 
 async def crawl_thaijo():
@@ -85,48 +86,54 @@ async def crawl_thaijo():
         print(f"✅ Save scraping result to {save_md_path}")
 
 
-async def cralw_pdf_links(web_urls: List[Dict], headless=True): # example: [{"Source A": "https://source-a.com"}]
-
-    browser_config = BrowserConfig(
-        headless=headless, # set to False for debugging | show browser
-        viewport_width=1280,
-        viewport_height=720,
-        verbose=False,
-    )
+async def crawl_source(sem: asyncio.Semaphore, crawler: AsyncWebCrawler, config: CrawlerRunConfig, item: Dict) -> Dict:
+    source_name, source_url = next(iter(item.items()))
 
-    results = {}
-    
-    for i, item in tqdm(enumerate(web_urls)):
-        
-        source_name, source_url = list(item.items())[0]
+    async with sem:
         LOGGER.info(f"source name: {source_name}, source_url: {source_url}")
         LOGGER.info("Start crawling ...")
-
-        crawler_config = CrawlerRunConfig(
-            session_id=source_name,
-            cache_mode=CacheMode.BYPASS,
-        )
-
-        async with AsyncWebCrawler(config=browser_config) as crawler:
+        try:
             # Scrape webpage
-            result = await crawler.arun(
-                url=source_url,  # Another pass
-                config=crawler_config,
-            )
+            result = await crawler.arun(url=source_url, config=config)
 
             # extract pdf links from markdown result
             pdf_links = extract_pdf_links_from_markdown(markdown_text=result.markdown)
-
+        except Exception as e:
+            LOGGER.error(f"[CRAWL ERROR] {source_url}: {e}")
+            pdf_links = []
+        else:
             LOGGER.info(f"✅ HTML Length After Click: {len(result.cleaned_html)}")
             LOGGER.info("\n ======= Preview all the pdf links =======\n")
             LOGGER.info(f"{pdf_links}\n")
 
-            # append to results dict
-            results[str(i)] = {
-                "url": source_url,
-                "links": pdf_links,
-                "source_name": source_name
-            }
+    return {
+        "url": source_url,
+        "links": pdf_links,
+        "source_name": source_name
+    }
+
+
+async def cralw_pdf_links(web_urls: List[Dict], headless=True): # example: [{"Source A": "https://source-a.com"}]
+
+    browser_config = BrowserConfig(
+        headless=headless, # set to False for debugging | show browser
+        viewport_width=1280,
+        viewport_height=720,
+        verbose=False,
+    )
+
+    # no session_id, every page is closed as soon as its crawl finishes
+    crawler_config = CrawlerRunConfig(
+        cache_mode=CacheMode.BYPASS,
+    )
+
+    # one browser for every source, at most CONCURRENCY pages open at a time
+    sem = asyncio.Semaphore(CONCURRENCY)
+    async with AsyncWebCrawler(config=browser_config) as crawler:
+        results_list = await tqdm.gather(*[crawl_source(sem, crawler, crawler_config, item) for item in web_urls])
+
+    # gather keeps input order, so indexes match web_urls
+    results = {str(i): item for i, item in enumerate(results_list)}
 
     # Save to JSON file
     output_file = os.path.join(THAIJO_DATA_PATH, "thaijo_pdf_links.json")
@@ -1,13 +1,25 @@
 import json
 import os
-import datetime
+import argparse
+import glob
+import zlib
+import hashlib
 import re
 import random
+import asyncio
+import functools
+import aiohttp
+import aiofiles
 import requests
+from requests.adapters import HTTPAdapter
 import logging
+import shutil
 import time
-from tqdm import tqdm
-from playwright.sync_api import sync_playwright
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit, urlunsplit
+from tqdm.asyncio import tqdm
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
 from . import THAIJO_DATA_PATH
 from utils.logger import setup_logging
 from .utils import get_pdf_links_from_json
@@ -15,57 +27,135 @@ from .utils import get_pdf_links_from_json
 
 SAVE_DIR = os.path.join(THAIJO_DATA_PATH, "pdfs")
 RESULTS_FILE = os.path.join(THAIJO_DATA_PATH, "pdf_download_links.json")
+RESULTS_JSONL_FILE = os.path.join(THAIJO_DATA_PATH, "pdf_download_links.jsonl")  # one {url: entry} per line
+RESULTS_SHARD_JSONL_FILE = os.path.join(THAIJO_DATA_PATH, "pdf_download_links.shard{}.jsonl")  # one per --shard worker
 LOGGER = setup_logging(
     log_file=os.path.join(THAIJO_DATA_PATH, "scrape_pdf_urls.log"),
     level=logging.DEBUG
 )
+CONCURRENCY = 32  # urls processed at the same time, one browser page each
+PDF_RESPONSE_TIMEOUT = 8  # seconds to wait for the pdf response once navigation starts
+COPY_CHUNK_SIZE = 1 << 18  # 256 KiB per write when saving Google Drive files
+SNAPSHOT_EVERY = 50  # urls between two snapshots of the full results JSON
+DOWNLOAD_WORKERS = 8  # pdf downloads in flight while the browser keeps discovering urls, also bounds open files
+DRIVE_WORKERS = 16  # Google Drive downloads running at once, plain requests in threads
+BLOCKED_RESOURCE_TYPES = {"image", "font", "stylesheet", "media"}  # never loaded by the browser pages
+
+# * ThaiJO article links that usually redirect straight to the pdf file
+_DIRECT_PDF_RE = re.compile(r"/article/(?:view|download)/\d+/\d+")
+
+# * Google Drive file id, from either /file/d/<id>/view or open?id=<id>
+_GDRIVE_ID_RE = re.compile(r"(?:/d/|id=)([a-zA-Z0-9_-]+)")
+
+# * one pooled session for every Google Drive download, keeps TLS connections alive across files and retries
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=32, pool_maxsize=64, max_retries=0))
+
+
+def shard_jsonl_paths():
+    return sorted(glob.glob(RESULTS_SHARD_JSONL_FILE.format("*")))
 
 
 def load_existing_results():
+    results = {}
     if os.path.exists(RESULTS_FILE):
-        with open(RESULTS_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
-    return {}
+        # * one read, json.loads decodes the UTF-8 bytes itself
+        with open(RESULTS_FILE, "rb") as f:
+            results.update(json.loads(f.read()))
+
+    # * entries appended after the last snapshot, then those of shards not merged yet
+    for path in [RESULTS_JSONL_FILE, *shard_jsonl_paths()]:
+        if not os.path.exists(path):
+            continue
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    results.update(json.loads(line))
+                except json.JSONDecodeError:
+                    LOGGER.warning(f"[SKIP] Unreadable line in {path}: {line[:100]!r}")
+    return results
 
 
-def save_results_to_file(results):
+def save_results_to_file(results, indent=None):
+    # * serialize in one go and write once, without indent the C encoder does all the work
+    separators = (",", ":") if indent is None else None
+    data = json.dumps(results, indent=indent, separators=separators, ensure_ascii=False)
     with open(RESULTS_FILE, "w", encoding="utf-8") as f:
-        json.dump(results, f, indent=4, ensure_ascii=False)
+        f.write(data)
+
+
+def merge_shard_results():
+    # * shard lines go after the main JSONL so they win on replay, a shard is removed only once copied
+    paths = shard_jsonl_paths()
+    with open(RESULTS_JSONL_FILE, "a", encoding="utf-8") as dst:
+        for path in paths:
+            with open(path, "r", encoding="utf-8") as src:
+                for line in src:
+                    if line.strip():
+                        dst.write(line if line.endswith("\n") else line + "\n")
+    for path in paths:
+        os.remove(path)
+
+    results = load_existing_results()
+    save_results_to_file(results)
+    LOGGER.info(f"[MERGE] Merged {len(paths)} shard(s), {len(results)} results saved to {RESULTS_FILE}")
 
 
-def get_download_url_from_fetch(page, url, max_retries=5):
-    pdf_urls = []
+def normalize_url(url: str) -> str:
+    # * scheme and host are case-insensitive, a trailing slash doesn't change the page
+    parts = urlsplit(url.strip())
+    path = parts.path.rstrip("/")  # also "/" -> "", so https://x/ and https://x are the same url
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, parts.query, parts.fragment))
 
-    def handle_response(response):
-        # * track only pdf content
-        if "application/pdf" in response.headers.get("content-type", ""):
-            pdf_urls.append(response.url)
 
-    page.on("response", handle_response)
+async def get_direct_pdf_url(http: aiohttp.ClientSession, url: str):
+    # * only probe urls that look like a pdf or a ThaiJO article download
+    if not (url.lower().endswith(".pdf") or _DIRECT_PDF_RE.search(url)):
+        return None
+
+    try:
+        async with http.head(url, allow_redirects=True, timeout=aiohttp.ClientTimeout(total=10)) as response:
+            if response.status == 200 and response.headers.get("content-type", "").startswith("application/pdf"):
+                LOGGER.info(f"[DIRECT] {url} resolves to a PDF without the browser")
+                return str(response.url)
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        LOGGER.debug(f"[DIRECT] HEAD probe failed for {url}: {e}")
+    return None
 
+
+def is_pdf_response(response) -> bool:
+    # * track only pdf content
+    return "application/pdf" in response.headers.get("content-type", "")
+
+
+async def get_download_url_from_fetch(page, url, max_retries=5):
     for attempt in range(max_retries):
+        # * armed before goto so a pdf response fired during navigation is not missed
+        pdf_response_task = asyncio.ensure_future(
+            page.wait_for_event("response", predicate=is_pdf_response, timeout=PDF_RESPONSE_TIMEOUT * 1000)
+        )
         try:
-            pdf_urls.clear()  # * clear previous attempts
-            response = page.goto(url, wait_until="networkidle")
+            response = await page.goto(url, wait_until="commit")
             status = response.status if response else None
 
             if status == 429:
                 wait_time = (2 ** attempt) + random.uniform(1.0, 3.0)
                 LOGGER.warning(f"Got 429 on page.goto for {url}. Retrying Round {attempt + 1} in {wait_time:.2f}s...")
-                time.sleep(wait_time)
+                await asyncio.sleep(wait_time)
                 continue
 
-            # * wait additional time to capture pdf requests triggered by js
-            page.wait_for_timeout(5000)
-
-            if pdf_urls:
-                LOGGER.debug(f"Captured PDF responses: {pdf_urls}")
-                return pdf_urls[0]  # * return the first detected pdf url
+            # * wakes up as soon as the pdf response is seen instead of a fixed sleep
+            try:
+                pdf_response = await pdf_response_task
+                LOGGER.debug(f"Captured PDF response: {pdf_response.url}")
+                return pdf_response.url
+            except PlaywrightTimeoutError:
+                pass
 
             # * optional fallback: extract direct links to pdfs from the dom
-            anchors = page.query_selector_all("a[href$='.pdf']")
+            anchors = await page.query_selector_all("a[href$='.pdf']")
             if anchors:
-                href = anchors[0].get_attribute("href")
+                href = await anchors[0].get_attribute("href")
                 if href:
                     full_url = page.url if href.startswith("http") else page.url.rsplit("/", 1)[0] + "/" + href
                     LOGGER.info(f"[FALLBACK] Found PDF href in DOM: {full_url}")
@@ -75,59 +165,95 @@ def get_download_url_from_fetch(page, url, max_retries=5):
             if attempt < max_retries - 1:
                 wait_time = (2 ** attempt) + random.uniform(1.0, 3.0)
                 LOGGER.warning(f"No PDF found for {url}. Retrying Round {attempt + 1} in {wait_time:.2f}s...")
-                time.sleep(wait_time)
+                await asyncio.sleep(wait_time)
                 continue
 
         except Exception as e:
+            # * navigating straight to a pdf can abort goto after the response was already seen
+            if pdf_response_task.done() and not pdf_response_task.cancelled() and pdf_response_task.exception() is None:
+                return pdf_response_task.result().url
             if attempt < max_retries - 1:
                 wait_time = (2 ** attempt) + random.uniform(1.0, 3.0)
                 LOGGER.error(f"Error loading {url}: {e}. Retrying Round {attempt + 1} in {wait_time:.2f}s...")
-                time.sleep(wait_time)
+                await asyncio.sleep(wait_time)
                 continue
             else:
                 LOGGER.error(f"[GIVE UP] Failed after {max_retries} attempts due to exception: {e}")
                 return None
 
+        finally:
+            if not pdf_response_task.done():
+                pdf_response_task.cancel()
+            elif not pdf_response_task.cancelled():
+                pdf_response_task.exception()  # * mark a timeout as retrieved
+
     LOGGER.error(f"[GIVE UP] Failed to find PDF URL for: {url} after {max_retries} attempts")
     return None
 
 
-def download_pdf_with_retries(pdf_download_url: str, save_dir: str, max_retries: int = 5):
-    os.makedirs(save_dir, exist_ok=True)
+def pdf_filepath(pdf_download_url: str, save_dir: str) -> str:
+    # * named after the url, so a second run finds the file on disk instead of downloading it again
+    key = hashlib.blake2b(pdf_download_url.encode(), digest_size=8).hexdigest()
+    return os.path.join(save_dir, f"{key}.pdf")
+
+
+def open_part_file(filepath: str):
+    # * unique temp name per attempt, two downloads of the same pdf never write into one .part
+    fd, part_path = tempfile.mkstemp(dir=os.path.dirname(filepath), prefix=os.path.basename(filepath) + ".", suffix=".part")
+    os.chmod(part_path, 0o644)  # mkstemp creates the file owner-only, keep the usual pdf permissions
+    return fd, part_path
+
+
+def remove_part_file(part_path: str):
+    # * a failed attempt leaves nothing behind
+    try:
+        os.remove(part_path)
+    except FileNotFoundError:
+        pass
+
+
+async def download_pdf_with_retries(http: aiohttp.ClientSession, pdf_download_url: str, save_dir: str, max_retries: int = 5):
+    filepath = pdf_filepath(pdf_download_url, save_dir)
+    if os.path.exists(filepath):
+        LOGGER.info(f"[CACHE HIT] {pdf_download_url} already saved to: {filepath}")
+        return filepath
+
+    request_timeout = aiohttp.ClientTimeout(total=None, sock_connect=15, sock_read=15)
 
     for attempt in range(max_retries):
         try:
-            response = requests.get(pdf_download_url, stream=True, timeout=15)
-
-            if response.status_code == 200:
-                basename = pdf_download_url.split("/")[-1].split("?")[0] or f"file_{int(time.time())}"
-                name, ext = os.path.splitext(basename)
-                if not ext:
-                    ext = ".pdf"
-                # save
-                timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-                filename = f"{name}_{timestamp}{ext}"
-                filepath = os.path.join(save_dir, filename)
-                with open(filepath, "wb") as f:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        f.write(chunk)
-
-                LOGGER.info(f"[DOWNLOADED] PDF saved to: {filepath}")
-                return filepath
-
-            elif response.status_code == 429:
-                wait_time = (2 ** attempt) + random.uniform(1.0, 5.0)
-                LOGGER.warning(f"[RATE LIMIT] Got 429 for {pdf_download_url}. Retrying in {wait_time:.2f}s...")
-                time.sleep(wait_time)
+            # the connection goes back to the session's pool on exit
+            async with http.get(pdf_download_url, timeout=request_timeout) as response:
+                if response.status == 200:
+                    # save to a .part file first, only a complete download gets the final name
+                    # writes go through aiofiles' threads so the event loop keeps serving other downloads
+                    # only the DOWNLOAD_WORKERS queue consumers get here, so at most that many files are open
+                    fd, part_path = open_part_file(filepath)
+                    try:
+                        async with aiofiles.open(fd, "wb") as f:
+                            async for chunk in response.content.iter_chunked(65536):
+                                await f.write(chunk)
+                        os.replace(part_path, filepath)
+                    except BaseException:
+                        remove_part_file(part_path)
+                        raise
+
+                    LOGGER.info(f"[DOWNLOADED] PDF saved to: {filepath}")
+                    return filepath
+
+                elif response.status == 429:
+                    wait_time = (2 ** attempt) + random.uniform(1.0, 5.0)
+                    LOGGER.warning(f"[RATE LIMIT] Got 429 for {pdf_download_url}. Retrying in {wait_time:.2f}s...")
+                    await asyncio.sleep(wait_time)
 
-            else:
-                LOGGER.warning(f"[FAILED] HTTP {response.status_code} for {pdf_download_url}")
-                return None
+                else:
+                    LOGGER.warning(f"[FAILED] HTTP {response.status} for {pdf_download_url}")
+                    return None
 
         except Exception as e:
             wait_time = (2 ** attempt) + random.uniform(1.0, 3.0)
             LOGGER.error(f"[ERROR] Download attempt {attempt + 1} failed for {pdf_download_url}: {str(e)}. Retrying in {wait_time:.2f}s")
-            time.sleep(wait_time)
+            await asyncio.sleep(wait_time)
 
     LOGGER.error(f"[GIVE UP] Failed to download after {max_retries} attempts: {pdf_download_url}")
 
@@ -135,7 +261,7 @@ def download_pdf_with_retries(pdf_download_url: str, save_dir: str, max_retries:
 def get_download_url_from_google_drive(url: str):
     # url must contains "drive.google.com"
     # Extract file ID from common Drive URL patterns
-    match = re.search(r'/d/([a-zA-Z0-9_-]+)', url) or re.search(r'id=([a-zA-Z0-9_-]+)', url)
+    match = _GDRIVE_ID_RE.search(url)
     if not match:
         LOGGER.warning(f"[INVALID] Could not extract Google Drive file ID from URL: {url}")
         return None
@@ -146,121 +272,287 @@ def get_download_url_from_google_drive(url: str):
 
 
 def download_pdf_from_google_drive(pdf_download_url, save_dir, max_retries=5) -> str:
-    session = requests.Session()
+    # blocking on purpose, only ever called through run_in_executor so its time.sleep backoff
+    # waits in a worker thread and never stalls the event loop
+    filepath = pdf_filepath(pdf_download_url, save_dir)
+    if os.path.exists(filepath):
+        LOGGER.info(f"[CACHE HIT] {pdf_download_url} already saved to: {filepath}")
+        return filepath
+
     for attempt in range(max_retries):
         try:
             LOGGER.debug(f"[DEBUG] Attempt {attempt + 1} to download file: {pdf_download_url} from Google Drive")
-            response = session.get(pdf_download_url, stream=True, timeout=15)
-
-            # Detect if Google asks for confirmation (large file virus scan warning)
-            if "Content-Disposition" not in response.headers:
-                # Search for confirm token in cookies
-                confirm_token = None
-                for key, value in response.cookies.items():
-                    if key.startswith('download_warning'):
-                        confirm_token = value
-                        break
-                
-                if confirm_token:
-                    confirm_url = f"{pdf_download_url}&confirm={confirm_token}"
-                    LOGGER.info("[INFO] Found virus scan confirmation token, retrying with confirmation...")
-                    response = session.get(confirm_url, stream=True, timeout=15)
-                else:
-                    LOGGER.warning("[WARNING] No confirmation token found, cannot proceed with download.")
-                    return None
+            # confirm=t skips the large file virus scan warning page up front, no token round trip needed
+            # the with block hands the connection back to the session's pool on every path
+            with _SESSION.get(pdf_download_url, params={"confirm": "t"}, stream=True, timeout=15) as response:
 
-            if response.status_code == 429:
-                wait_time = (2 ** attempt) + random.uniform(1.0, 5.0)
-                LOGGER.warning(f"[RATE LIMIT] Received 429 Too Many Requests. Retrying in {wait_time:.2f} seconds...")
-                time.sleep(wait_time)
-                continue
+                # Without Content-Disposition Google answered with an HTML page instead of the file
+                if response.status_code == 200 and "Content-Disposition" not in response.headers:
+                    LOGGER.warning("[WARNING] Google Drive did not return a file, cannot proceed with download.")
+                    return None
 
-            if response.status_code != 200:
-                LOGGER.warning(f"[FAILED] Unexpected status code {response.status_code} on attempt {attempt + 1}")
-                wait_time = (2 ** attempt) + random.uniform(1.0, 3.0)
-                time.sleep(wait_time)
-                continue
+                if response.status_code == 429:
+                    wait_time = (2 ** attempt) + random.uniform(1.0, 5.0)
+                    LOGGER.warning(f"[RATE LIMIT] Received 429 Too Many Requests. Retrying in {wait_time:.2f} seconds...")
 
-            # Save content to file
-            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-            file_id = pdf_download_url.split("id=")[-1] # google file shared id
-            filename = f"{file_id}_{timestamp}.pdf"
-            filepath = os.path.join(save_dir, filename)
-            with open(filepath, "wb") as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
+                elif response.status_code != 200:
+                    LOGGER.warning(f"[FAILED] Unexpected status code {response.status_code} on attempt {attempt + 1}")
+                    wait_time = (2 ** attempt) + random.uniform(1.0, 3.0)
 
-            LOGGER.info(f"[DOWNLOADED] Downloaded Google Drive pdf file saved to {filepath}")
-            return filepath
+                else:
+                    # Save content to a .part file, renamed once complete
+                    # copy in 256 KiB blocks, decode_content undoes any gzip transfer encoding on the raw stream
+                    response.raw.decode_content = True
+                    fd, part_path = open_part_file(filepath)
+                    try:
+                        with open(fd, "wb") as f:
+                            shutil.copyfileobj(response.raw, f, length=COPY_CHUNK_SIZE)
+                        os.replace(part_path, filepath)
+                    except BaseException:
+                        remove_part_file(part_path)
+                        raise
+
+                    LOGGER.info(f"[DOWNLOADED] Downloaded Google Drive pdf file saved to {filepath}")
+                    return filepath
+
+            # back off only after the response is closed, so the connection isn't held while sleeping
+            time.sleep(wait_time)
 
         except requests.RequestException as e:
             wait_time = (2 ** attempt) + random.uniform(1.0, 3.0)
             LOGGER.error(f"[ERROR] Request failed on attempt {attempt + 1}: {e}. Retrying in {wait_time:.2f} seconds...")
             time.sleep(wait_time)
 
-    LOGGER.error(f"[GIVE UP] Failed to download Google Drive file {file_id} after {max_retries} attempts.")
+    LOGGER.error(f"[GIVE UP] Failed to download Google Drive file {pdf_download_url} after {max_retries} attempts.")
     return None
 
 
-def fetch_and_download_pdfs_from_urls(url_list):
-    results = load_existing_results()
-    start_time = time.time()
+async def block_heavy_resources(route):
+    # * only the pdf response matters, images, fonts, styles and media are never needed
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+async def open_page_pool(browser, size: int):
+    # * pages are created once and reused, a new context per url costs hundreds of ms of Chromium work
+    context = await browser.new_context()
+    await context.route("**/*", block_heavy_resources)  # once per context, covers every pooled page
+    page_pool = asyncio.Queue()
+    for _ in range(size):
+        page_pool.put_nowait(await context.new_page())
+    return context, page_pool
+
+
+async def process_drive_url(executor: ThreadPoolExecutor, index: int, url: str):
+    # google drive needs no browser, the blocking requests download runs on the executor's threads
+    LOGGER.info(f"================= [ITEM] Process item index: {index} ================= ")
+    LOGGER.info(f"[START] Fetching PDF from: {url}")
+
+    # metadata to save
+    pdf_download_link = None
+    saved_filepath = None
+
+    try:
+        pdf_download_link = get_download_url_from_google_drive(url)
+        if pdf_download_link:
+            LOGGER.info(f"[SUCCESS] Found PDF: {pdf_download_link}")
+            saved_filepath = await asyncio.get_running_loop().run_in_executor(
+                executor, functools.partial(download_pdf_from_google_drive, pdf_download_link, save_dir=SAVE_DIR, max_retries=5)
+            )
+        else:
+            LOGGER.warning(f"[FAILED] No PDF found at: {url}")
+    except Exception as e:
+        LOGGER.error(f"[ERROR] Exception while processing Google Drive URL {url}: {str(e)}")
+
+    return {"download_link": pdf_download_link, 
+            "filename": os.path.basename(saved_filepath) if saved_filepath else None}
+
+
+async def reset_page(page):
+    """
+    Stop whatever the page is still loading before it goes back to the pool,
+    otherwise a late pdf response of this url would be credited to the next one.
+
+    Returns:
+        Page: The same page on about:blank, or a fresh page if it could not be reset
+    """
+    try:
+        if not page.is_closed():
+            await page.goto("about:blank")
+            return page
+    except Exception as e:
+        LOGGER.warning(f"[PAGE] Could not reset page, replacing it: {e}")
+        try:
+            await page.close()
+        except Exception:
+            pass
+    # * a closed page is also replaced on its next use, so never shrink the pool here
+    try:
+        return await page.context.new_page()
+    except Exception:
+        return page
+
+
+async def process_url(sem: asyncio.Semaphore, page_pool: asyncio.Queue, http: aiohttp.ClientSession, download_queue: asyncio.Queue, index: int, url: str):
+    """
+    Find the pdf behind a web url and hand it to the download workers,
+    so the browser page is freed right away.
+
+    Returns:
+        dict: Result entry when the url is finished, None when its download was queued
+    """
+    async with sem:
+        LOGGER.info(f"================= [ITEM] Process item index: {index} ================= ")
+        LOGGER.info(f"[START] Fetching PDF from: {url}")
+
+        pdf_download_link = None
 
-    LOGGER.info(f"Starting PDF extraction for {len(url_list)} URLs.")
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        context = browser.new_context()
-        page = context.new_page()
-
-        for index, url in tqdm(enumerate(url_list), desc="Processing URLs"):
-            LOGGER.info(f"================= [ITEM] Process item index: {index} ================= ")
-
-            # if url in results and results[url] is not None:
-            if url in results and results[url]["download_link"] is not None:
-                LOGGER.info(f"[SKIP] Already processed: {url}")
-                LOGGER.info(f"================= [ITEM] Finished item index: {index} ================= ")
-                continue
+        try:
+            # urls that resolve straight to a pdf skip the browser entirely
+            pdf_download_link = await get_direct_pdf_url(http, url)
 
-            LOGGER.info(f"[START] Fetching PDF from: {url}")
+            if not pdf_download_link:
+                # download from FETCH/XHL network on a page borrowed from the pool
+                page = await page_pool.get()
+                try:
+                    if page.is_closed():
+                        page = await page.context.new_page()  # replace a crashed page
+                    pdf_download_link = await get_download_url_from_fetch(page, url, max_retries=5)
+                finally:
+                    page = await reset_page(page)
+                    page_pool.put_nowait(page)
+
+            if pdf_download_link:
+                LOGGER.info(f"[SUCCESS] Found PDF: {pdf_download_link}")
+                # Download from pdf_url in a download worker
+                await download_queue.put((index, url, pdf_download_link))
+                return None
+            else:
+                LOGGER.warning(f"[FAILED] No PDF found at: {url}")
+        except Exception as e:
+            LOGGER.error(f"[ERROR] Exception while processing pdf url from fetch result {url}: {str(e)}")
 
-            # metadata to save
-            pdf_download_link = None
+    # nothing was downloaded for this url
+    return {"download_link": pdf_download_link, "filename": None}
+
+
+async def download_worker(http: aiohttp.ClientSession, download_queue: asyncio.Queue, record):
+    # * consume (index, url, pdf_download_link) until cancelled
+    while True:
+        index, url, pdf_download_link = await download_queue.get()
+        try:
+            saved_filepath = await download_pdf_with_retries(http, pdf_download_link, save_dir=SAVE_DIR, max_retries=5)
+        except Exception as e:
+            LOGGER.error(f"[ERROR] Exception while downloading {pdf_download_link}: {str(e)}")
             saved_filepath = None
+        try:
+            record(index, url, {"download_link": pdf_download_link, 
+                                "filename": os.path.basename(saved_filepath) if saved_filepath else None})
+        except Exception as e:
+            # * a dead worker would leave download_queue.join() waiting forever, keep consuming
+            LOGGER.error(f"[ERROR] Could not record result for {url}: {str(e)}")
+        finally:
+            download_queue.task_done()
+
+
+async def fetch_and_download_pdfs_from_urls(url_list, results_jsonl_file=RESULTS_JSONL_FILE, snapshot=True, shard_count=1):
+    """
+    Find and download the pdf behind every url, resuming from earlier results.
+
+    Args:
+        url_list: Article or Google Drive urls
+        results_jsonl_file: JSONL file the results are appended to
+        snapshot: Also rewrite RESULTS_FILE periodically, off for shards since they run side by side
+        shard_count: Number of shard processes running side by side, the per-host limits are split between them
+    """
+    # * the same article is often linked from several magazines, crawl each one once
+    total_urls = len(url_list)
+    url_list = list(dict.fromkeys(map(normalize_url, url_list)))
+    LOGGER.info(f"[DEDUP] {total_urls} URLs, {len(url_list)} unique after normalization.")
 
-            if "drive.google.com" in url:
-                # download from google drive
-                try:
-                    pdf_download_link = get_download_url_from_google_drive(url)
-                    if pdf_download_link:
-                        LOGGER.info(f"[SUCCESS] Found PDF: {pdf_download_link}")
-                        saved_filepath = download_pdf_from_google_drive(pdf_download_link, save_dir=SAVE_DIR, max_retries=5)
-                    else:
-                        LOGGER.warning(f"[FAILED] No PDF found at: {url}")
-                except Exception as e:
-                    LOGGER.error(f"[ERROR] Exception while processing Google Drive URL {url}: {str(e)}")
-            else:
-                # download from FETCH/XHL network
-                try:
-                    pdf_download_link = get_download_url_from_fetch(page, url, max_retries=5)
-
-                    if pdf_download_link:
-                        LOGGER.info(f"[SUCCESS] Found PDF: {pdf_download_link}")
-                        # Download from pdf_url
-                        saved_filepath = download_pdf_with_retries(pdf_download_link, save_dir=SAVE_DIR, max_retries=5)
-                    else:
-                        LOGGER.warning(f"[FAILED] No PDF found at: {url}")
-                except Exception as e:
-                    LOGGER.error(f"[ERROR] Exception while processing pdf url from fetch result {url}: {str(e)}")
-            
-            # save download link to json file
-            results[url] = {"download_link": pdf_download_link, 
-                            "filename": os.path.basename(saved_filepath) if saved_filepath else None}
-            save_results_to_file(results)
-            LOGGER.info(f"[SAVED] Updated results to JSON.")
-            LOGGER.info(f"================= [ITEM] Finished item index: {index} ================= ")
-
-        browser.close()
+    results = load_existing_results()
+    start_time = time.time()
+
+    # * drop already processed urls up front, so the progress bar only counts real work
+    # * keys of older runs may be un-normalized, compare them in the same form as url_list
+    processed = {normalize_url(u) for u, v in results.items() if isinstance(v, dict) and v.get("download_link")}
+    pending = [(index, url) for index, url in enumerate(url_list) if url not in processed]
+    LOGGER.info(f"[SKIP] {len(url_list) - len(pending)} URL(s) already processed, {len(pending)} left.")
+
+    os.makedirs(SAVE_DIR, exist_ok=True)
+
+    saved_count = 0
+
+    def record(jsonl_file, index, url, entry):
+        nonlocal saved_count
+        results[url] = entry
+        # append one line per url instead of rewriting the whole JSON every time
+        jsonl_file.write(json.dumps({url: entry}, ensure_ascii=False) + "\n")
+        LOGGER.info(f"[SAVED] Appended result to JSONL.")
+
+        saved_count += 1
+        if saved_count % SNAPSHOT_EVERY == 0:
+            # * flushed for shards too, a killed run then loses at most SNAPSHOT_EVERY results
+            jsonl_file.flush()
+            if snapshot:
+                save_results_to_file(results)
+                LOGGER.info(f"[SNAPSHOT] Saved {len(results)} results to JSON.")
+        LOGGER.info(f"================= [ITEM] Finished item index: {index} ================= ")
+
+    async def discover(sem, page_pool, http, download_queue, jsonl_file, index, url):
+        entry = await process_url(sem, page_pool, http, download_queue, index, url)
+        if entry is not None:
+            record(jsonl_file, index, url, entry)
+
+    async def download_drive(executor, jsonl_file, index, url):
+        record(jsonl_file, index, url, await process_drive_url(executor, index, url))
+
+    # * drive files go straight to the thread pool, only web urls need the browser
+    drive_pending = [(index, url) for index, url in pending if "drive.google.com" in url]
+    web_pending = [(index, url) for index, url in pending if "drive.google.com" not in url]
+
+    # * every shard hits the same soNN.tci-thaijo.org and drive hosts, so together they stay within one run's limits
+    concurrency = max(1, CONCURRENCY // shard_count)
+    limit_per_host = max(1, 4 // shard_count)
+    drive_workers = max(1, DRIVE_WORKERS // shard_count)
+
+    LOGGER.info(f"Starting PDF extraction for {len(url_list)} URLs.")
+    sem = asyncio.Semaphore(concurrency)
+    # resolved addresses are kept for 10 minutes, there are ~100 soNN/heNN.tci-thaijo.org hosts to look up
+    connector = aiohttp.TCPConnector(limit=64, limit_per_host=limit_per_host, use_dns_cache=True, ttl_dns_cache=600)
+    async with (
+        async_playwright() as p,
+        aiohttp.ClientSession(connector=connector) as http,
+    ):
+        drive_executor = ThreadPoolExecutor(max_workers=drive_workers)
+        browser = await p.chromium.launch(headless=True)
+        context, page_pool = await open_page_pool(browser, concurrency)
+
+        with open(results_jsonl_file, "a", encoding="utf-8", buffering=1 << 16) as jsonl_file:
+            # downloads overlap with discovery, the workers drain the queue as pdf urls are found
+            download_queue = asyncio.Queue()
+            workers = [asyncio.create_task(download_worker(http, download_queue, functools.partial(record, jsonl_file)))
+                       for _ in range(DOWNLOAD_WORKERS)]
+
+            await tqdm.gather(*[download_drive(drive_executor, jsonl_file, index, url) for index, url in drive_pending],
+                              *[discover(sem, page_pool, http, download_queue, jsonl_file, index, url) for index, url in web_pending],
+                              desc="Processing URLs")
+
+            # wait for the queued downloads, then stop the idle workers
+            await download_queue.join()
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+        drive_executor.shutdown()
+        await context.close()
+        await browser.close()
+
+    # final snapshot
+    if snapshot:
+        save_results_to_file(results)
 
     elapsed = time.time() - start_time
     LOGGER.info(f"Completed processing {len(url_list)} URLs in {elapsed:.2f} seconds.")
@@ -269,7 +561,40 @@ def fetch_and_download_pdfs_from_urls(url_list):
     return results
 
 
+def parse_shard(value: str):
+    try:
+        shard_index, shard_count = map(int, value.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected i/N, got {value!r}")
+    if not 0 <= shard_index < shard_count:
+        raise argparse.ArgumentTypeError(f"shard index must be in [0, {shard_count}), got {shard_index}")
+    return shard_index, shard_count
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Fetch and download ThaiJO PDFs")
+
+    parser.add_argument(
+        "--shard",
+        type=parse_shard,
+        default=None,
+        help="Process only shard i of N (e.g. 0/4), results go to their own JSONL"
+    )
+
+    parser.add_argument(
+        "--merge",
+        action="store_true",
+        help="Merge the shard results into pdf_download_links.json and exit"
+    )
+    return parser.parse_args()
+
+
 def main():
+    args = parse_args()
+    if args.merge:
+        merge_shard_results()
+        return
+
     # step 4: get all scraped pdf links
     urls = get_pdf_links_from_json(os.path.join(THAIJO_DATA_PATH, "thaijo_pdf_links.json"))
 
@@ -279,7 +604,18 @@ def main():
     #         break
 
     # # step 5: go through each pdf_links and download pdf files
-    pdf_links = fetch_and_download_pdfs_from_urls(urls[320:])
+    urls = urls[320:]
+    if args.shard:
+        # split by a stable hash of the normalized url, so duplicates always land in the same shard
+        shard_index, shard_count = args.shard
+        urls = [url for url in urls if zlib.crc32(normalize_url(url).encode()) % shard_count == shard_index]
+        LOGGER.info(f"[SHARD] {shard_index}/{shard_count} takes {len(urls)} URLs.")
+        pdf_links = asyncio.run(fetch_and_download_pdfs_from_urls(
+            urls, results_jsonl_file=RESULTS_SHARD_JSONL_FILE.format(shard_index), snapshot=False,
+            shard_count=shard_count,
+        ))
+    else:
+        pdf_links = asyncio.run(fetch_and_download_pdfs_from_urls(urls))
 
     print("\n=== Summary ===")
     for source_url, pdf_url in pdf_links.items():
@@ -287,4 +623,8 @@ def main():
     print("=== End ===")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
+
+# use case
+# uv run python -m crawl.thaijo.fetch_pdf_urls --shard 0/4   (one per shard, 0/4 .. 3/4)
+# uv run python -m crawl.thaijo.fetch_pdf_urls --merge
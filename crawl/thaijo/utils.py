@@ -5,12 +5,20 @@ import time
 import requests
 from tqdm import tqdm
 import json
+import itertools
 from typing import List, Dict
 import re
 from utils.logger import setup_logging
 from . import *
 
 
+# Match pattern: [label](url "title")
+_MD_LINK_RE = re.compile(r'\[\s*(.*?)\s*\]\(\s*(\S+)(?:\s+"(.*?)")?\s*\)')
+
+# Match markdown links whose text mentions pdf: [text](url)
+_PDF_LINK_RE = re.compile(r'\[([^\]]*pdf[^\]]*)\]\((https?://[^\)]+)\)', re.IGNORECASE)
+
+
 def extract_markdown_from_h2(input_filepath: str, target_h2_text: str) -> str:
     """
     Reads a Markdown file, finds the specified H2 tag, and saves all content
@@ -31,18 +39,24 @@ def extract_markdown_from_h2(input_filepath: str, target_h2_text: str) -> str:
         with open(input_filepath, "r", encoding="utf-8") as file:
             content = file.read()
 
-        # Construct the Markdown H2 tag pattern to search for
-        # We use a regex to be flexible with spaces after '##'
-        # re.escape is used to escape any special characters in the target_h2_text
-        import re
-        search_pattern = re.compile(r'^##\s*' + re.escape(target_h2_text) + r'\s*$', re.MULTILINE)
-
-        # Search for the target H2 tag
-        match = search_pattern.search(content)
-
-        if match:
-            # Get the starting index of the matched H2 tag
-            start_index = match.start()
+        # Search for the target H2 tag with a plain substring scan,
+        # the heading is a fixed literal so no regex is needed
+        needle = f"## {target_h2_text}"
+        start_index = -1
+        if "## " in content:
+            pos = 0 if content.startswith(needle) else content.find("\n" + needle)
+            while pos != -1:
+                if content[pos] == "\n":
+                    pos += 1  # skip the newline
+                # The heading only counts if nothing but whitespace follows it on the line,
+                # so "## วารสารทั้งหมด 2" is not taken for "## วารสารทั้งหมด"
+                line_end = content.find("\n", pos + len(needle))
+                if not content[pos + len(needle):line_end if line_end != -1 else None].strip():
+                    start_index = pos
+                    break
+                pos = content.find("\n" + needle, pos + len(needle))
+
+        if start_index != -1:
             # Extract content from the start_index to the end of the file
             extracted_content = content[start_index:]
             return extracted_content
@@ -64,13 +78,8 @@ def extract_markdown_links_as_json(markdown_text: str) -> List[Dict[str, str]]:
     Returns:
         List[Dict[str, str]]: A list of label-URL pairs as dictionaries.
     """
-    # Match pattern: [label](url "title")
-    pattern = re.compile(r'\[\s*(.*?)\s*\]\(\s*(\S+)(?:\s+"(.*?)")?\s*\)')
-    
-    matches = pattern.findall(markdown_text)
-    
     # Return as list of dicts: {label: url}
-    return [{label: url} for label, url, _ in matches]
+    return [{match.group(1): match.group(2)} for match in _MD_LINK_RE.finditer(markdown_text)]
 
 
 def extract_pdf_links_from_markdown(markdown_text: str) -> List[str]:
@@ -86,13 +95,12 @@ def extract_pdf_links_from_markdown(markdown_text: str) -> List[str]:
     if not isinstance(markdown_text, str):
         raise ValueError("Input must be a string")
 
-    # Regex pattern to match markdown links: [text](url)
-    pattern = re.compile(r'\[([^\]]*pdf[^\]]*)\]\((https?://[^\)]+)\)', re.IGNORECASE)
+    # Cheap substring check first, skip the regex when no link can match
+    if "pdf" not in markdown_text.casefold():
+        return []
 
-    matches = pattern.findall(markdown_text)
-    pdf_links = [url for _, url in matches]
-
-    return pdf_links
+    # Single pass over the matches, no intermediate list of (text, url) tuples
+    return [match.group(2) for match in _PDF_LINK_RE.finditer(markdown_text)]
 
 
 def get_pdf_links_from_json(json_file: str) -> list[str]:
@@ -105,14 +113,12 @@ def get_pdf_links_from_json(json_file: str) -> list[str]:
     Returns:
         list[str]: A flat list of all PDF URLs.
     """
-    with open(json_file, "r", encoding="utf-8") as f:
-        data = json.load(f)
-
-    all_links = []
-    for item in data.values():
-        all_links.extend(item.get("links", []))
+    # * one read, json.loads decodes the UTF-8 bytes itself
+    with open(json_file, "rb") as f:
+        data = json.loads(f.read())
 
-    return all_links
+    # Flatten in one pass instead of growing the list with repeated extend calls
+    return list(itertools.chain.from_iterable(item.get("links", []) for item in data.values()))
 
 
 # def check_pdf_downloadable(urls, verify_pdf_header=True):
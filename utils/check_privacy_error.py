@@ -1,4 +1,6 @@
-import requests
+import ssl
+import socket
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urlparse
 
 # --- Configuration ---
@@ -17,49 +19,88 @@ from urllib.parse import urlparse
 
 # --- Main Script ---
 
+PROBE_WORKERS = 64
+PROBE_TIMEOUT = 10
+
+# The default context verifies the certificate chain and the hostname, like requests does
+_SSL_CONTEXT = ssl.create_default_context()
+
+
+def probe_tls(host, port=443):
+    """
+    Opens a TCP connection and completes a TLS handshake, no HTTP request is sent.
+
+    Args:
+        host: The hostname to connect to.
+        port: The TLS port.
+
+    Returns:
+        A (status, message) tuple, status is "SUCCESS" or "ERROR".
+    """
+    try:
+        with socket.create_connection((host, port), timeout=PROBE_TIMEOUT) as sock:
+            with _SSL_CONTEXT.wrap_socket(sock, server_hostname=host):
+                return "SUCCESS", "Connection is secure. The SSL certificate is valid."
+
+    except ssl.SSLCertVerificationError as e:
+        # This is the primary error we are looking for.
+        # It indicates a problem with the SSL certificate.
+        return "ERROR", f"Privacy Error Detected! The SSL certificate is invalid. Reason: {e.verify_message or e}"
+
+    except ssl.SSLError as e:
+        return "ERROR", f"Privacy Error Detected! The TLS handshake failed. Reason: {e}"
+
+    except (socket.timeout, TimeoutError):
+        # Handle cases where the server doesn't respond in time.
+        return "ERROR", "Connection timed out. The server did not respond."
+
+    except OSError as e:
+        # Handle other connection issues, like DNS failure or connection refused.
+        return "ERROR", f"Could not connect to the server. Reason: {e}"
+
+
 def check_url_privacy(urls):
     """
     Checks a list of URLs for SSL/TLS certificate issues.
 
+    Each distinct host is probed once with a bare TLS handshake, and the
+    probes run concurrently on a thread pool.
+
     Args:
         urls: A list of URLs to check.
     """
     print("--- Starting URL Privacy Check ---")
+
+    # Parse every URL up front so each (host, port) is handshaked only once
+    targets = {}
+    invalid = {}
+    for url in urls:
+        try:
+            parsed_url = urlparse(url)
+            if parsed_url.scheme.lower() == 'https' and parsed_url.hostname:
+                targets[url] = (parsed_url.hostname, parsed_url.port or 443)
+        except ValueError as e:
+            # e.g. a non-numeric port, report it for this URL instead of aborting the whole check
+            invalid[url] = f"Invalid URL. Reason: {e}"
+
+    unique_targets = list(dict.fromkeys(targets.values()))
+    with ThreadPoolExecutor(max_workers=PROBE_WORKERS) as executor:
+        outcomes = dict(zip(unique_targets, executor.map(lambda t: probe_tls(*t), unique_targets)))
+
+    # Report in the original order
     for url in urls:
         print(f"\n[INFO] Checking: {url}")
-        
+
+        if url in invalid:
+            print(f"[ERROR] {invalid[url]}")
+            continue
+
         # Check if the URL uses HTTPS
-        parsed_url = urlparse(url)
-        if parsed_url.scheme.lower() != 'https':
+        if url not in targets:
             print(f"[WARNING] The URL is not using HTTPS. Connections to this site may not be private.")
             continue
 
-        try:
-            # The 'requests' library by default verifies SSL certificates.
-            # We set a timeout to avoid waiting indefinitely for a response.
-            response = requests.get(url, timeout=10)
-            
-            # A successful request (status code 200) with no SSL error means the certificate is valid.
-            if response.status_code == 200:
-                print(f"[SUCCESS] Connection is secure. The SSL certificate is valid.")
-            else:
-                print(f"[WARNING] Connected successfully, but received an unusual status code: {response.status_code}")
-
-        except requests.exceptions.SSLError as e:
-            # This is the primary error we are looking for.
-            # It indicates a problem with the SSL certificate.
-            print(f"[ERROR] Privacy Error Detected! The SSL certificate is invalid. Reason: {e}")
-        
-        except requests.exceptions.Timeout:
-            # Handle cases where the server doesn't respond in time.
-            print(f"[ERROR] Connection timed out. The server did not respond.")
-            
-        except requests.exceptions.ConnectionError as e:
-            # Handle other connection issues, like DNS failure or connection refused.
-            print(f"[ERROR] Could not connect to the server. Reason: {e}")
-            
-        except requests.exceptions.RequestException as e:
-            # A catch-all for any other 'requests' related exceptions.
-            print(f"[ERROR] An unexpected error occurred: {e}")
+        status, message = outcomes[targets[url]]
+        print(f"[{status}] {message}")
 
     print("\n--- URL Privacy Check Complete ---")
@@ -1,46 +1,64 @@
 import os
 import logging
 
-def setup_logging(log_file="output.log", level=logging.INFO):
+LOGGER_NAME = "web_scraping"  # one logger shared by every package
+
+
+def setup_logging(log_file=None, level=logging.WARNING):
     """
     Sets up a logger to output messages to both console and a file.
 
     Args:
-        log_file (str): The name of the log file.
+        log_file (str): The name of the log file. Defaults to the LOG_FILE
+                        environment variable; no file handler is added if neither is set.
         level (int): The logging level (e.g., logging.INFO, logging.DEBUG).
+                     The LOG_LEVEL environment variable (e.g. "DEBUG") overrides it.
 
     Returns:
         logging.Logger: The configured logger instance.
     """
+    # Per-item chatter stays off unless LOG_LEVEL or the caller turns it on
+    env_level = os.environ.get("LOG_LEVEL")
+    if env_level:
+        # getLevelName returns a "Level X" string for unknown names, keep the caller's level then
+        resolved = logging.getLevelName(env_level.strip().upper())
+        if isinstance(resolved, int):
+            level = resolved
+
     # Create a logger
-    logger = logging.getLogger(__name__)
+    logger = logging.getLogger(LOGGER_NAME)
     logger.setLevel(level)
+    # Handle records here instead of walking up to the root logger's handlers
+    logger.propagate = False
+
+    formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+
+    # Prevent adding multiple handlers if the function is called multiple times,
+    # a later call only updates the level (FileHandler subclasses StreamHandler,
+    # hence the exact type check)
+    console_handler = next((h for h in logger.handlers if type(h) is logging.StreamHandler), None)
+    if console_handler is None:
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(formatter)
+        logger.addHandler(console_handler)
+    console_handler.setLevel(level)
 
-    # Prevent adding multiple handlers if the function is called multiple times
-    if not logger.handlers:
+    # Only open a log file when one is asked for, and only once per process
+    log_file = log_file or os.environ.get("LOG_FILE")
+    if log_file and not any(isinstance(h, logging.FileHandler) for h in logger.handlers):
         # Ensure log directory exists
-        os.makedirs(os.path.dirname(log_file), exist_ok=True)
+        log_dir = os.path.dirname(log_file)
+        if log_dir:
+            os.makedirs(log_dir, exist_ok=True)
 
-        # Create file handler which logs even debug messages
         file_handler = logging.FileHandler(log_file)
         file_handler.setLevel(level)
-
-        # Create console handler with a higher log level
-        console_handler = logging.StreamHandler()
-        console_handler.setLevel(level)
-
-        # Create formatter and add it to the handlers
-        formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
         file_handler.setFormatter(formatter)
-        console_handler.setFormatter(formatter)
-
-        # Add the handlers to the logger
         logger.addHandler(file_handler)
-        logger.addHandler(console_handler)
 
     return logger
 
-# LOGGER = setup_logging()
+LOGGER = setup_logging()
 
 # Example usage (optional, for testing logger_config.py directly)
 # if __name__ == "__main__":
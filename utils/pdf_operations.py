@@ -1,15 +1,73 @@
 import requests
 import os
-import shutil
-import pandas as pd
+import sys
+import tempfile
+import logging
+import asyncio
+import aiohttp
+import aiofiles
+import openpyxl
 from tqdm import tqdm
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from .logger import LOGGER
 
 
+CHECK_WORKERS = 32
+DOWNLOAD_CONCURRENCY = 32
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+WRITE_BATCH_SIZE = 1 << 20  # coalesce network chunks into ~1 MiB disk writes
+# * per-connect / per-read limits like the old requests timeout=10, a large PDF that keeps
+# * streaming is never cut off by a total deadline
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=None, sock_connect=10, sock_read=10)
+
+# * Shared session so probes reuse pooled keep-alive connections
+_SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(
+    pool_connections=64,
+    pool_maxsize=64,
+    max_retries=Retry(total=2, backoff_factor=0.3),
+)
+_SESSION.mount("http://", _ADAPTER)
+_SESSION.mount("https://", _ADAPTER)
+
+
+def _probe(url):
+    """
+    Fetches the first bytes of a URL and returns it if they are the PDF magic bytes.
+
+    Args:
+        url (str): The URL to check.
+
+    Returns:
+        str | None: The URL if it looks like a PDF, otherwise None.
+    """
+    try:
+        # Ask for the first 5 bytes only; Content-Type headers are often wrong, the magic bytes are not.
+        # Streaming keeps a server that ignores Range (200 + full body) from sending the whole file.
+        with _SESSION.get(url, headers={'Range': 'bytes=0-4'}, stream=True,
+                          allow_redirects=True, timeout=5) as response:
+            response.raise_for_status()  # Raise HTTPError for bad responses (4xx or 5xx)
+            head = response.raw.read(5, decode_content=True)
+
+        if head.startswith(b'%PDF'):
+            LOGGER.info("Found PDF: %s", url)
+            return url
+        if LOGGER.isEnabledFor(logging.DEBUG):
+            LOGGER.debug("Skipping: %s - Not a PDF by header bytes: %r", url, head)
+
+    except requests.exceptions.RequestException as e:
+        LOGGER.warning("Error checking %s: %s", url, e)  # Use warning for network errors
+    except Exception as e:
+        LOGGER.error("An unexpected error occurred while checking %s: %s", url, e)
+    return None
+
+
 def check_pdf_downloadable(urls):
     """
-    Checks if a list of URLs are likely to be downloadable PDFs by 
-    verifying the content type and performing a HEAD request.
+    Checks if a list of URLs are downloadable PDFs by requesting the
+    first bytes of each (Range: bytes=0-4) and checking for "%PDF".
 
     Args:
         urls (list): A list of URLs to check.
@@ -19,28 +77,119 @@ def check_pdf_downloadable(urls):
     """
 
     downloadable_pdfs = []
-    LOGGER.info(f"Starting check for downloadable PDFs on {len(urls)} URLs.")
-    for url in tqdm(urls, desc="Checking PDF URLs"):
+    LOGGER.info("Starting check for downloadable PDFs on %s URLs.", len(urls))
+    # * Probes are network-bound, so run them on a thread pool; map keeps input order
+    with ThreadPoolExecutor(max_workers=CHECK_WORKERS) as executor:
+        for url in tqdm(executor.map(_probe, urls), total=len(urls), desc="Checking PDF URLs"):
+            if url is not None:
+                downloadable_pdfs.append(url)
+
+    LOGGER.info("Finished PDF check. Found %s downloadable PDFs.", len(downloadable_pdfs))
+    return downloadable_pdfs
+
+
+def _drop_page_cache(filepath):
+    """
+    Tells the kernel the written PDF will not be read back soon, so its pages
+    can leave the page cache instead of evicting more useful ones.
+    DONTNEED only drops clean pages, so the data is synced first. Blocking,
+    call it through asyncio.to_thread. Best effort: a no-op where
+    posix_fadvise is unavailable (e.g. Windows, macOS).
+
+    Args:
+        filepath (str): The path of the file that was just written.
+    """
+    if not hasattr(os, "posix_fadvise"):
+        return
+    try:
+        fd = os.open(filepath, os.O_RDONLY)
         try:
-            # Perform a HEAD request to get headers without downloading the whole file
-            response = requests.head(url, allow_redirects=True, timeout=5)
-            response.raise_for_status()  # Raise HTTPError for bad responses (4xx or 5xx)
+            os.fdatasync(fd)
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        finally:
+            os.close(fd)
+    except OSError:
+        pass
 
-            content_type = response.headers.get('Content-Type', '')
-            # Check if content type indicates a PDF (case-insensitive)
-            if 'pdf' in content_type.lower():
-                downloadable_pdfs.append(url)
-                LOGGER.info(f"Found PDF: {url}")
-            else:
-                LOGGER.info(f"Skipping: {url} - Content-Type is not PDF: {content_type}")
 
-        except requests.exceptions.RequestException as e:
-            LOGGER.warning(f"Error checking {url}: {e}")  # Use warning for network errors
+async def _fetch(session, url, download_folder, sem):
+    """
+    Streams a single PDF to disk over the shared aiohttp session.
+
+    Args:
+        session (aiohttp.ClientSession): The shared HTTP session.
+        url (str): The URL of the PDF file.
+        download_folder (str): The folder where the PDF is saved.
+        sem (asyncio.Semaphore): Limits the number of in-flight downloads.
+    """
+    # Extract filename from URL or generate one if not available
+    filename = url.rpartition('/')[2] or "downloaded_pdf"
+    if not filename.endswith(".pdf"):
+        filename += ".pdf"
+
+    filepath = os.path.join(download_folder, filename)
+
+    # Check if the file already exists, skip if it does
+    if os.path.exists(filepath):
+        if LOGGER.isEnabledFor(logging.DEBUG):
+            LOGGER.debug("Skipping download: %s already exists at %s.", filename, filepath)
+        return
+
+    # Only in-flight downloads hold a file descriptor; every task is started at once,
+    # so claiming the temp file before the semaphore would open one fd per URL
+    saved = False
+    async with sem:
+        part_path = None
+        try:
+            # Unique temp file per download: an interrupted one never looks complete and
+            # two URLs mapping to the same filename never write into one file
+            fd, part_path = tempfile.mkstemp(dir=download_folder, prefix=filename + ".", suffix=".part")
+            async with aiofiles.open(fd, 'wb') as f:  # aiofiles owns and closes the descriptor
+                async with session.get(url, timeout=REQUEST_TIMEOUT) as r:
+                    r.raise_for_status()  # Raise ClientResponseError for bad responses (4xx or 5xx)
+                    # * Buffer chunks so each write() syscall (and aiofiles thread hop) moves ~1 MiB
+                    buffer = bytearray()
+                    async for chunk in r.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+                        buffer += chunk
+                        if len(buffer) >= WRITE_BATCH_SIZE:
+                            await f.write(buffer)
+                            buffer.clear()
+                    if buffer:
+                        await f.write(buffer)
+            os.chmod(part_path, 0o644)  # mkstemp creates the file owner-only
+            os.replace(part_path, filepath)
+            part_path = None
+            saved = True
+            LOGGER.info("Downloaded: %s from %s", filename, url)
+
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            LOGGER.warning("Error downloading %s: %s", url, e)
+        except OSError as e:
+            LOGGER.error("Error saving %s from %s: %s", filename, url, e)
         except Exception as e:
-            LOGGER.error(f"An unexpected error occurred while checking {url}: {e}")
+            LOGGER.error("An unexpected error occurred while handling %s: %s", url, e)
+        finally:
+            # Never leave a partial file behind
+            if part_path is not None:
+                try:
+                    os.remove(part_path)
+                except OSError:
+                    pass
 
-    LOGGER.info(f"Finished PDF check. Found {len(downloadable_pdfs)} downloadable PDFs.")
-    return downloadable_pdfs
+    # Flush and drop the page cache after the slot is released, so the sync never
+    # holds back the next download
+    if saved:
+        await asyncio.to_thread(_drop_page_cache, filepath)
+
+
+async def _download_all(urls, download_folder):
+    sem = asyncio.Semaphore(DOWNLOAD_CONCURRENCY)
+    # * One connector for the whole batch so TCP/TLS connections and DNS lookups are reused
+    connector = aiohttp.TCPConnector(limit=64, limit_per_host=8, ttl_dns_cache=300)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        tasks = [_fetch(session, url, download_folder, sem) for url in urls]
+        for task in tqdm(asyncio.as_completed(tasks), total=len(tasks), desc="Downloading PDFs"):
+            await task
 
 
 def download_pdfs(urls, download_folder):
@@ -52,41 +201,36 @@ def download_pdfs(urls, download_folder):
         download_folder (str): The path to the folder where PDFs should be saved.
     """
 
-    LOGGER.info(f"Starting PDF download to folder: {download_folder}")
+    LOGGER.info("Starting PDF download to folder: %s", download_folder)
     if not os.path.exists(download_folder):
         os.makedirs(download_folder)
-        LOGGER.info(f"Created download folder: {download_folder}")
+        LOGGER.info("Created download folder: %s", download_folder)
+
+    asyncio.run(_download_all(urls, download_folder))
+
+    LOGGER.info("Finished PDF download for %s URLs.", len(urls))
 
-    for url in tqdm(urls, desc="Downloading PDFs"):
-        try:
-            # Extract filename from URL or generate one if not available
-            filename = url.split('/')[-1] if url.split('/')[-1] else "downloaded_pdf"
-            if not filename.endswith(".pdf"):
-                filename += ".pdf"
-
-            filepath = os.path.join(download_folder, filename)
-
-            # Check if the file already exists, skip if it does
-            if os.path.exists(filepath):
-                LOGGER.info(f"Skipping download: {filename} already exists at {filepath}.")
-                continue
-
-            # Use streaming to handle potentially large files efficiently
-            with requests.get(url, stream=True, allow_redirects=True, timeout=10) as r:
-                r.raise_for_status() # Raise HTTPError for bad responses (4xx or 5xx)
-                # Save the PDF file
-                with open(filepath, 'wb') as f:
-                    shutil.copyfileobj(r.raw, f)
-                LOGGER.info(f"Downloaded: {filename} from {url}")
-
-        except requests.exceptions.RequestException as e:
-            LOGGER.warning(f"Error downloading {url}: {e}")
-        except OSError as e:
-            LOGGER.error(f"Error saving {filename} from {url}: {e}")
-        except Exception as e:
-            LOGGER.error(f"An unexpected error occurred while handling {url}: {e}")
-    
-    LOGGER.info(f"Finished PDF download for {len(urls)} URLs.")
+
+def _read_excel_urls(filepath):
+    """
+    Reads the 'url' column of the active sheet with openpyxl's read-only row iterator.
+
+    Args:
+        filepath (str): The path to the Excel file.
+
+    Returns:
+        list | None: The stripped URL cells, or None if the header has no 'url' column.
+    """
+    wb = openpyxl.load_workbook(filepath, read_only=True, data_only=True)
+    try:
+        rows = wb.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if not header or 'url' not in header:
+            return None
+        idx = header.index('url')
+        return [str(row[idx]).strip() for row in rows if len(row) > idx and row[idx] is not None]
+    finally:
+        wb.close()  # read-only workbooks keep the file handle open until closed
 
 
 def retrieve_unique_urls(data_folder: str):
@@ -102,45 +246,58 @@ def retrieve_unique_urls(data_folder: str):
         data_folder (str): The path to the folder containing the data files.
 
     Returns:
-        set: A set of unique URLs found across all specified files.
+        tuple: The unique URLs found across all specified files, sorted, so the
+               result is hashable and cheap to iterate more than once.
     """
 
     unique_urls = set()
-    LOGGER.info(f"Starting URL retrieval from folder: {data_folder}")
+    LOGGER.info("Starting URL retrieval from folder: %s", data_folder)
 
     if not os.path.exists(data_folder):
-        LOGGER.error(f"Data folder not found: {data_folder}")
-        return unique_urls
+        LOGGER.error("Data folder not found: %s", data_folder)
+        return ()
 
-    for filename in tqdm(os.listdir(data_folder), desc="Retrieving URLs"):
-        filepath = os.path.join(data_folder, filename)
+    # * scandir yields the entry type with the name, so no extra stat per file
+    with os.scandir(data_folder) as it:
+        entries = [(entry.name, entry.path) for entry in it if entry.is_file()]
 
+    for filename, filepath in tqdm(entries, desc="Retrieving URLs"):
         if filename.endswith(".txt"):
             try:
                 with open(filepath, 'r', encoding='utf-8') as f:
-                    for line in f:
-                        url = line.strip()  # Remove leading/trailing whitespace
-                        if url:  # Ensure the line is not empty
-                            unique_urls.add(url)
-                LOGGER.info(f"Processed text file: {filename}")
+                    # Strip whitespace and drop empty lines
+                    unique_urls.update(url for url in map(str.strip, f) if url)
+                LOGGER.info("Processed text file: %s", filename)
             except Exception as e:
-                LOGGER.error(f"Error reading text file {filename}: {e}. Skipping.")
+                LOGGER.error("Error reading text file %s: %s. Skipping.", filename, e)
 
         elif filename.endswith(".xlsx"):
             try:
-                df = pd.read_excel(filepath)
-                # Assuming the first column contains URLs
+                urls = _read_excel_urls(filepath)
+                if urls is not None:
+                    unique_urls.update(url for url in urls if url)
+                    LOGGER.info("Processed Excel file: %s", filename)
+                    continue
+
+                # Fall back to pandas (first sheet) only when the active sheet has no 'url' header
+                import pandas as pd
+
+                try:
+                    df = pd.read_excel(filepath, usecols=['url'], engine='openpyxl', dtype=str)
+                except ValueError:
+                    df = pd.DataFrame()
                 if not df.empty and 'url' in df.columns:  # Check if 'url' column exists
                     for url in df['url'].dropna().astype(str):  # Handle potential NaNs and ensure string type
                         if url:
                             unique_urls.add(url.strip())
-                    LOGGER.info(f"Processed Excel file: {filename}")
+                    LOGGER.info("Processed Excel file: %s", filename)
                 else:
-                    LOGGER.warning(f"No 'url' column or empty sheet in {filename}. Skipping.")
+                    LOGGER.warning("No 'url' column or empty sheet in %s. Skipping.", filename)
             except Exception as e:
-                LOGGER.error(f"Error reading Excel file {filename}: {e}. Skipping.")
+                LOGGER.error("Error reading Excel file %s: %s. Skipping.", filename, e)
         else:
-            LOGGER.debug(f"Skipping non-txt/xlsx file: {filename}")
+            LOGGER.debug("Skipping non-txt/xlsx file: %s", filename)
 
-    LOGGER.info(f"Finished URL retrieval. Found {len(unique_urls)} unique URLs.")
-    return unique_urls
\ No newline at end of file
+    LOGGER.info("Finished URL retrieval. Found %s unique URLs.", len(unique_urls))
+    # Interned so URLs compared again downstream hit the identity fast path
+    return tuple(sorted(sys.intern(url) for url in unique_urls))
\ No newline at end of file